@@ -1,7 +1,10 @@
 from file_io import *
 from learning import *
 from training import *
+from answer_log import show_stats
+from wrong_book import sort_wrong_book, set_merge_wrong_books
 from word_adding import *
+from translation_cache import close_translation_cache
 from os import system
 
 # 定义命令与对应函数及参数格式的映射
@@ -24,6 +27,12 @@ COMMAND_MAPPING = {
         add_words_from_chinese,
         ()
     ),
+    "search_meaning": (
+        search_meaning,
+        (
+            ("query", str),
+        )
+    ),
     "add_tranjy": (
         add_words_from_chinese_synonyms,
         ()
@@ -40,12 +49,45 @@ COMMAND_MAPPING = {
             ("file_index", int),
         )
     ),
+    "list_backups": (
+        list_backups,
+        (
+            ("file_index", int),
+        )
+    ),
+    "restore_backup": (
+        restore_backup,
+        (
+            ("file_index", int),
+            ("backup_index", int),
+        )
+    ),
+    "convert_text_to_indexed": (
+        convert_text_to_indexed_by_index,
+        (
+            ("file_index", int),
+        )
+    ),
+    "convert_indexed_to_text": (
+        convert_indexed_to_text_by_index,
+        (
+            ("file_index", int),
+        )
+    ),
     "delete": (
         delete_words_from_file,
         (
             ("file_index", int),
         )
     ),
+    "dedup": (
+        remove_duplicates_from_file,
+        (
+            ("file_index", int),
+            ("merge_by_word", int),
+            ("in_place", int),
+        )
+    ),
     "copy_portion": (
         copy_portion_words,
         (
@@ -76,6 +118,53 @@ COMMAND_MAPPING = {
             ("backup_old_wrong", int),
         )
     ),
+    "test_words_hard": (
+        test_words_hard,
+        (
+            ("file_index", int),
+            ("test_mode", int),
+            ("backup_old_wrong", int),
+        )
+    ),
+    "resume_test": (
+        resume_test,
+        ()
+    ),
+    "schedule_words": (
+        schedule_words,
+        (
+            ("file_index", int),
+        )
+    ),
+    "review": (
+        review,
+        (
+            ("test_mode", int),
+            ("limit", int),
+        )
+    ),
+    "stats": (
+        show_stats,
+        (
+            ("top_n", int),
+        )
+    ),
+    "cache_stats": (
+        show_words_cache_stats,
+        ()
+    ),
+    "set_merge_wrong_books": (
+        set_merge_wrong_books,
+        (
+            ("enabled", int),
+        )
+    ),
+    "sort_wrong_book": (
+        sort_wrong_book,
+        (
+            ("file_index", int),
+        )
+    ),
 }
 
 # 教程字符串，用于帮助信息
@@ -84,14 +173,28 @@ TUTORIAL_DICT = {
     "get_words": "\n **get_words**\n   - 功能：获取当前文件中的单词。\n   - 用法：`get_words <file_index>`\n   - 参数：`file_index`（整数，表示文件索引）\n",
     "add_tran": "\n **add_tran**\n   - 功能：从英文添加单词。\n   - 用法：`add_tran`\n",
     "add_rtran": "\n **add_rtran**\n   - 功能：从中文添加单词。\n   - 用法：`add_rtran`\n",
+    "search_meaning": "\n **search_meaning**\n   - 功能：在所有单词本及翻译缓存中查找词义包含指定汉语的单词。\n   - 用法：`search_meaning <query>`\n   - 参数：`query`（字符串，表示要查找的汉语）\n",
     "add_tranjy": "\n **add_tranjy**\n   - 功能：从中文同义词添加单词。\n   - 用法：`add_tranjy`\n",
     "insert": "\n **insert**\n   - 功能：从文件中插入单词。\n   - 用法：`insert <file_index>`\n   - 参数：`file_index`（整数，表示文件索引）\n",
     "save_old": "\n **save_old**\n   - 功能:备份单词表。\n   -用法:`save_old <file_index`\n   - 参数：`file_index`（整数，表示文件索引）\n",
+    "list_backups": "\n **list_backups**\n   - 功能：列出单词表的所有备份。\n   - 用法：`list_backups <file_index>`\n   - 参数：`file_index`（整数，表示文件索引）\n",
+    "restore_backup": "\n **restore_backup**\n   - 功能：将单词表恢复为某个备份，恢复前会先备份当前内容。\n   - 用法：`restore_backup <file_index> <backup_index>`\n   - 参数：\n     - `file_index`（整数，表示文件索引）\n     - `backup_index`（整数，表示备份序号，1-based）\n",
+    "convert_text_to_indexed": "\n **convert_text_to_indexed**\n   - 功能：将单词表转换为索引单词本（<name>$.wbd和<name>$.wbi），学习和复制单词时按需读取条目。\n   - 用法：`convert_text_to_indexed <file_index>`\n   - 参数：`file_index`（整数，表示文件索引）\n",
+    "convert_indexed_to_text": "\n **convert_indexed_to_text**\n   - 功能：将索引单词本转换回文本单词表。\n   - 用法：`convert_indexed_to_text <file_index>`\n   - 参数：`file_index`（整数，表示文件索引）\n",
     "delete": "\n **delete**\n   - 功能：从文件中删除单词。\n   - 用法：`delete <file_index>`\n   - 参数：`file_index`（整数，表示文件索引）\n",
+    "dedup": "\n **dedup**\n   - 功能：去除单词表中的重复单词。\n   - 用法：`dedup <file_index> <merge_by_word> <in_place>`\n   - 参数：\n     - `file_index`（整数，表示文件索引）\n     - `merge_by_word`（整数，是否按单词合并重复条目及其词义）\n     - `in_place`（整数，是否直接改写原单词表，否则写入_del_re副本）\n",
     "copy_portion": "\n **copy_portion**\n   - 功能：复制文件中的一部分单词。\n   - 用法：`copy_portion <original_file_index> <begin_index> <end_index> <backup_old_temp_words>`\n   - 参数：\n     - `original_file_index`（整数，表示原始文件索引）\n     - `begin_index`（整数，表示开始索引，1-based）\n     - `end_index`（整数，表示结束索引）\n     - `backup_old_temp_words`（整数，是否备份旧词表）\n",
     "get_length": "\n **get_length**\n   - 功能：获取文件中单词的数量。\n   - 用法：`get_length <file_index>`\n   - 参数：`file_index`（整数，表示文件索引）\n",
     "learning": "\n **learning**\n   - 功能：进入学习模式。\n   - 用法：`learning <file_index> <mode>`\n   - 参数：\n     - `file_index`（整数，表示文件索引）\n     - `mode`（整数，表示学习模式，0表示命令行顺序模式，1表示命令行随机模式，2表示窗体学习模式）\n",
     "test_words": "\n **test_words**\n   - 功能：进行单词测试。\n   - 用法：`test_words <file_index> <test_mode> <backup_old_wrong>`\n   - 参数：\n     - `file_index`（整数，表示文件索引）\n     - `test_mode`（整数，表示测试模式，1表示词义，2表示英译汉，3表示听写）\n     - `backup_old_wrong`（整数，表示是否备份错误单词）\n",
+    "test_words_hard": "\n **test_words_hard**\n   - 功能：进行困难模式的单词测试，干扰项取与正确答案最相近的单词。\n   - 用法：`test_words_hard <file_index> <test_mode> <backup_old_wrong>`\n   - 参数：\n     - `file_index`（整数，表示文件索引，模式1还可以为999）\n     - `test_mode`（整数，表示测试模式，1表示词义（干扰项词义相近），2表示英译汉（干扰项拼写相近））\n     - `backup_old_wrong`（整数，表示是否备份错误单词）\n",
+    "resume_test": "\n **resume_test**\n   - 功能：继续上次中途退出（quit()）的测试，从退出的题目开始，错题与之前的合并计入错题本。\n   - 用法：`resume_test`\n",
+    "schedule_words": "\n **schedule_words**\n   - 功能：把单词表中的单词加入艾宾浩斯复习计划（追加到艾宾浩斯单词表，文件索引5）。\n   - 用法：`schedule_words <file_index>`\n   - 参数：`file_index`（整数，表示文件索引）\n",
+    "review": "\n **review**\n   - 功能：复习已到期的单词，并根据答题结果安排下次复习时间。\n   - 用法：`review <test_mode> <limit>`\n   - 参数：\n     - `test_mode`（整数，表示测试模式，1表示词义，2表示英译汉，3表示听写）\n     - `limit`（整数，表示本次最多复习的单词数，0表示全部到期单词）\n",
+    "stats": "\n **stats**\n   - 功能：统计答题记录：总体及各测试模式的正确率、用时分位数和最薄弱的单词。\n   - 用法：`stats <top_n>`\n   - 参数：`top_n`（整数，表示显示的最薄弱单词数量）\n",
+    "cache_stats": "\n **cache_stats**\n   - 功能：显示单词本读取缓存的命中统计（读取次数、命中次数、命中率和已缓存的单词本数）。\n   - 用法：`cache_stats`\n",
+    "set_merge_wrong_books": "\n **set_merge_wrong_books**\n   - 功能：开启或关闭错题本合并模式：开启后测试结束时把错题合并进错题本并记录答错次数，重测错题本时移除答对的单词；关闭时覆盖错题本。\n   - 用法：`set_merge_wrong_books <enabled>`\n   - 参数：`enabled`（整数，1表示开启，0表示关闭）\n",
+    "sort_wrong_book": "\n **sort_wrong_book**\n   - 功能：按答错次数从多到少重新排列错题本（答错次数在合并模式下记录，见set_merge_wrong_books），改写前先备份。\n   - 用法：`sort_wrong_book <file_index>`\n   - 参数：`file_index`（整数，表示错题本的文件索引）\n",
     "help": "\n **help**\n    - 功能：显示本教程。\n    - 用法：`help`\n",
     "exit": "\n **exit**\n    - 功能：退出程序。\n    - 用法：`exit`\n",
     "advanced": "\n **advanced**\n    - 功能：进入高级模式，允许执行Python语句。\n    - 用法：`advanced`\n    - 退出高级模式：`exit advanced`\n"
@@ -102,14 +205,28 @@ COMMANDS = [
     "get_words",
     "add_tran",
     "add_rtran",
+    "search_meaning",
     "add_tranjy",
     "insert",
     "save_old",
+    "list_backups",
+    "restore_backup",
+    "convert_text_to_indexed",
+    "convert_indexed_to_text",
     "delete",
+    "dedup",
     "copy_portion",
     "get_length",
     "learning",
     "test_words",
+    "test_words_hard",
+    "resume_test",
+    "schedule_words",
+    "review",
+    "stats",
+    "cache_stats",
+    "set_merge_wrong_books",
+    "sort_wrong_book",
     "help",
     "exit",
     "advanced"
@@ -136,6 +253,8 @@ def main():
         print('\n\n')
         command = scan_and_write_to_log("输入命令：")
         if command == "exit":
+            sync_pending_writes()
+            close_translation_cache()
             return None
         if command == "help":
             print(f"以下为教程：\n{''.join([TUTORIAL_DICT[command] for command in COMMANDS])}")
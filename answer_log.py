@@ -0,0 +1,173 @@
+"""
+答题记录模块：把每一道题的作答情况追加写入二进制事件日志，并用 NumPy 统计。
+
+单词本文件夹下的三个文件：
+    answer_events.bin：文件头 + 每道题 24 字节的定长记录
+        （答题时间、单词本编号、单词编号、用时、测试模式、尝试次数、是否答对）
+    answer_events.books：每行一个单词本名称，行号即单词本编号
+    answer_events.words：每行一个规范化后的单词，行号即单词编号
+日志只追加不修改，统计时用 numpy.fromfile 一次读入，所有统计都是向量化运算。
+NumPy 为可选依赖，只有统计时需要。
+"""
+
+import struct
+from os.path import exists, getsize
+from time import time
+
+from word_format import normalize_word
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+EVENTS_PATH = "answer_events.bin"
+BOOKS_PATH = "answer_events.books"
+WORDS_PATH = "answer_events.words"
+EVENTS_MAGIC = b"AEV1"
+# 单条记录：答题时间、单词本编号、单词编号、用时（秒）、测试模式、尝试次数、是否答对
+EVENT = struct.Struct("<dIIfBBBx")
+
+# 名称到编号的映射：文件路径 -> {名称: 编号}（第一次写入时从文件载入）
+name_ids = {}
+
+
+def get_name_id(path: str, name: str) -> int:
+    """
+    获取单词本或单词的编号，新名称追加到名称文件末尾。
+
+    Args:
+        path (str): 名称文件路径（BOOKS_PATH 或 WORDS_PATH）。
+        name (str): 名称。
+
+    Returns:
+        int: 编号。
+    """
+    ids = name_ids.get(path)
+    if ids is None:
+        ids = {name: i for i, name in enumerate(read_names(path))}
+        name_ids[path] = ids
+    if name not in ids:
+        ids[name] = len(ids)
+        with open(path, "a", encoding="utf-8") as file:
+            file.write(f"{name}\n")
+    return ids[name]
+
+
+def read_names(path: str) -> list:
+    """
+    读取名称文件。
+
+    Args:
+        path (str): 名称文件路径。
+
+    Returns:
+        list: 按编号排列的名称。
+    """
+    if not exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as file:
+        return file.read().split("\n")[:-1]
+
+
+def log_answer(book: str, word: str, test_mode: int, attempts: int, correct: bool, latency: float) -> None:
+    """
+    追加一条答题记录。
+
+    Args:
+        book (str): 单词本名称。
+        word (str): 单词。
+        test_mode (int): 测试模式。
+        attempts (int): 尝试次数。
+        correct (bool): 是否答对。
+        latency (float): 从出题到作答结束的用时（秒）。
+    """
+    record = EVENT.pack(time(), get_name_id(BOOKS_PATH, book), get_name_id(WORDS_PATH, normalize_word(word)),
+                        latency, test_mode, min(attempts, 255), int(correct))
+    if not exists(EVENTS_PATH):
+        with open(EVENTS_PATH, "wb") as file:
+            file.write(EVENTS_MAGIC)
+    with open(EVENTS_PATH, "ab") as file:
+        file.write(record)
+
+
+def load_events():
+    """
+    读取全部答题记录。
+
+    Returns:
+        numpy.ndarray | None: 结构化数组，字段为 time、book、word、latency、mode、attempts、correct；
+            没有记录时返回 None。
+    """
+    if not exists(EVENTS_PATH) or getsize(EVENTS_PATH) <= len(EVENTS_MAGIC):
+        return None
+    dtype = np.dtype([("time", "<f8"), ("book", "<u4"), ("word", "<u4"), ("latency", "<f4"),
+                      ("mode", "u1"), ("attempts", "u1"), ("correct", "u1"), ("pad", "u1")])
+    # 写入中断留下的不完整记录忽略
+    count = (getsize(EVENTS_PATH) - len(EVENTS_MAGIC)) // dtype.itemsize
+    return np.fromfile(EVENTS_PATH, dtype=dtype, count=count, offset=len(EVENTS_MAGIC))
+
+
+def summarize_events(events, top_n: int = 20) -> dict:
+    """
+    统计答题记录。
+
+    Args:
+        events (numpy.ndarray): load_events 的返回值。
+        top_n (int): 最薄弱单词的数量。
+
+    Returns:
+        dict: 包含 total、accuracy、modes（各模式的题数、正确率、用时的 50/90/99 分位数）
+            和 weakest（(单词编号, 答题次数, 正确率) 列表，按正确率从低到高）的字典。
+    """
+    correct = events["correct"].astype(np.float64)
+    summary = {"total": len(events), "accuracy": float(correct.mean()), "modes": {}}
+
+    for mode in np.unique(events["mode"]):
+        selected = events["mode"] == mode
+        latency = events["latency"][selected]
+        summary["modes"][int(mode)] = {
+            "count": int(selected.sum()),
+            "accuracy": float(correct[selected].mean()),
+            "latency": [float(value) for value in np.percentile(latency, [50, 90, 99])],
+        }
+
+    # 按单词聚合：答题次数、答对次数
+    counts = np.bincount(events["word"])
+    rights = np.bincount(events["word"], weights=correct)
+    answered = np.nonzero(counts)[0]
+    accuracy = rights[answered] / counts[answered]
+    # 正确率从低到高，相同时答题次数多的在前
+    order = np.lexsort((-counts[answered], accuracy))[:top_n]
+    summary["weakest"] = [(int(answered[i]), int(counts[answered[i]]), float(accuracy[i])) for i in order]
+    return summary
+
+
+def show_stats(top_n: int) -> None:
+    """
+    输出答题统计：总体正确率、各测试模式的正确率和用时分位数、最薄弱的单词。
+
+    Args:
+        top_n (int): 显示的最薄弱单词数量。
+    """
+    if np is None:
+        print("统计功能需要安装 numpy：pip install numpy")
+        return
+    events = load_events()
+    if events is None:
+        print("还没有答题记录！")
+        return
+
+    summary = summarize_events(events, top_n)
+    mode_names = {1: "单词到释义", 2: "释义到单词", 3: "释义到默写"}
+    print(f"共{summary['total']}道题，正确率{summary['accuracy']:.1%}")
+    for mode, mode_summary in summary["modes"].items():
+        p50, p90, p99 = mode_summary["latency"]
+        print(f"{mode_names.get(mode, mode)}：{mode_summary['count']}道题，正确率{mode_summary['accuracy']:.1%}，"
+              f"用时中位数{p50:.1f}秒，90%分位{p90:.1f}秒，99%分位{p99:.1f}秒")
+
+    words = read_names(WORDS_PATH)
+    print(f"\n最薄弱的{len(summary['weakest'])}个单词：")
+    for word_id, count, accuracy in summary["weakest"]:
+        word = words[word_id] if word_id < len(words) else f"#{word_id}"
+        print(f"{word}：答题{count}次，正确率{accuracy:.1%}")
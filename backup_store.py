@@ -0,0 +1,169 @@
+"""
+备份存储模块：以内容寻址、去重的方式保存单词本的历史快照。
+
+单词本按条目内容切分为数据块，每个数据块以其 SHA-256 命名并压缩保存，
+内容相同的数据块只保存一次；每次备份只额外写入一个记录数据块顺序的清单文件。
+目录结构（位于单词本文件夹下）：
+    .backups/objects/<哈希前两位>/<哈希>   压缩后的数据块
+    .backups/manifests/<单词本名>/<时间戳>.json   快照清单
+"""
+
+import json
+import zlib
+from hashlib import sha1, sha256
+from os import listdir, makedirs, replace
+from os.path import join, exists
+from time import time
+
+from word_format import format_entries, iter_entries
+
+BACKUP_DIR = ".backups"
+# 条目哈希的低位全为 0 时切块，平均每块约 32 个条目
+CHUNK_MASK = 0x1F
+# 单个数据块最多包含的条目数
+MAX_CHUNK_ENTRIES = 256
+
+
+def get_object_path(digest: str) -> str:
+    """
+    获取数据块的保存路径。
+
+    Args:
+        digest (str): 数据块内容的 SHA-256。
+
+    Returns:
+        str: 数据块文件路径。
+    """
+    return join(BACKUP_DIR, "objects", digest[:2], digest)
+
+
+def get_manifest_dir(file_name: str) -> str:
+    """
+    获取单词本快照清单所在的目录。
+
+    Args:
+        file_name (str): 单词本文件名。
+
+    Returns:
+        str: 清单目录路径。
+    """
+    return join(BACKUP_DIR, "manifests", file_name)
+
+
+def split_chunks(words: list, meanings: list) -> list[str]:
+    """
+    按条目内容切分单词本。切分点只取决于条目本身，
+    因此插入或删除条目只会改变附近的数据块，其余数据块保持不变。
+
+    Args:
+        words (list): 单词列表。
+        meanings (list): 词义列表。
+
+    Returns:
+        list[str]: 各数据块的辅助文件格式内容。
+    """
+    chunks = []
+    entries = []
+    for word, meaning in zip(words, meanings):
+        entry = format_entries([word], [meaning])
+        entries.append(entry)
+        boundary = sha1(entry.encode("utf-8")).digest()[-1] & CHUNK_MASK == 0
+        if boundary or len(entries) >= MAX_CHUNK_ENTRIES:
+            chunks.append("".join(entries))
+            entries = []
+    if entries:
+        chunks.append("".join(entries))
+    return chunks
+
+
+def save_snapshot(file_name: str, words: list, meanings: list, timestamp: str) -> int:
+    """
+    保存单词本快照，只写入尚未保存过的数据块。
+
+    Args:
+        file_name (str): 单词本文件名。
+        words (list): 单词列表。
+        meanings (list): 词义列表。
+        timestamp (str): 快照时间戳。
+
+    Returns:
+        int: 本次新写入的数据块数量。
+    """
+    digests = []
+    new_chunks = 0
+    for chunk in split_chunks(words, meanings):
+        data = chunk.encode("utf-8")
+        digest = sha256(data).hexdigest()
+        digests.append(digest)
+        object_path = get_object_path(digest)
+        if exists(object_path):
+            continue
+        makedirs(join(BACKUP_DIR, "objects", digest[:2]), exist_ok=True)
+        with open(f"{object_path}.tmp", "wb") as file:
+            file.write(zlib.compress(data))
+        replace(f"{object_path}.tmp", object_path)
+        new_chunks += 1
+
+    manifest = {
+        "file_name": file_name,
+        "timestamp": timestamp,
+        "saved_at": time(),
+        "count": len(words),
+        "chunks": digests,
+    }
+    manifest_dir = get_manifest_dir(file_name)
+    makedirs(manifest_dir, exist_ok=True)
+    with open(join(manifest_dir, f"{timestamp}.json"), "w", encoding="utf-8") as file:
+        json.dump(manifest, file, ensure_ascii=False)
+    return new_chunks
+
+
+def list_snapshots(file_name: str) -> list[dict]:
+    """
+    列出单词本的所有快照，按时间先后排序。
+
+    Args:
+        file_name (str): 单词本文件名。
+
+    Returns:
+        list[dict]: 各快照的清单内容。
+    """
+    manifest_dir = get_manifest_dir(file_name)
+    if not exists(manifest_dir):
+        return []
+    manifests = []
+    for name in listdir(manifest_dir):
+        if not name.endswith(".json"):
+            continue
+        with open(join(manifest_dir, name), "r", encoding="utf-8") as file:
+            manifests.append(json.load(file))
+    # 时间戳的小数部分位数不固定，按保存时间排序
+    manifests.sort(key=lambda manifest: manifest["saved_at"])
+    return manifests
+
+
+def load_snapshot(file_name: str, timestamp: str) -> tuple[list, list]:
+    """
+    读取单词本快照的内容。
+
+    Args:
+        file_name (str): 单词本文件名。
+        timestamp (str): 快照时间戳。
+
+    Returns:
+        tuple[list, list]: 单词列表和词义列表。
+    """
+    with open(join(get_manifest_dir(file_name), f"{timestamp}.json"), "r", encoding="utf-8") as file:
+        manifest = json.load(file)
+
+    def read_chunks():
+        for digest in manifest["chunks"]:
+            with open(get_object_path(digest), "rb") as chunk_file:
+                yield zlib.decompress(chunk_file.read()).decode("utf-8")
+
+    words = []
+    meanings = []
+    for word, meaning in iter_entries(read_chunks()):
+        words.append(word)
+        meanings.append(meaning)
+    return words, meanings
@@ -0,0 +1,60 @@
+"""
+答题统计基准测试：生成大量合成答题记录，测量读取和统计的耗时。
+
+用法：
+    python benchmarks/bench_answer_stats.py [记录数] [单词数]
+
+默认生成 3000000 条记录、100000 个单词。
+"""
+
+import os
+import sys
+import tempfile
+from os.path import dirname, abspath
+from time import perf_counter
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+
+import numpy as np
+
+from answer_log import EVENTS_MAGIC, EVENTS_PATH, load_events, summarize_events
+
+
+def write_synthetic_events(count: int, word_count: int) -> None:
+    """
+    直接按日志格式写入合成记录。
+    """
+    rng = np.random.default_rng(0)
+    events = np.zeros(count, dtype=[("time", "<f8"), ("book", "<u4"), ("word", "<u4"), ("latency", "<f4"),
+                                    ("mode", "u1"), ("attempts", "u1"), ("correct", "u1"), ("pad", "u1")])
+    events["time"] = 1.7e9 + np.arange(count, dtype=np.float64)
+    events["book"] = rng.integers(0, 5, count)
+    events["word"] = rng.integers(0, word_count, count)
+    events["latency"] = rng.lognormal(1.0, 0.6, count)
+    events["mode"] = rng.integers(1, 4, count)
+    events["attempts"] = rng.integers(0, 4, count)
+    events["correct"] = rng.random(count) < 0.7
+    with open(EVENTS_PATH, "wb") as file:
+        file.write(EVENTS_MAGIC)
+        events.tofile(file)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 3000000
+    word_count = int(sys.argv[2]) if len(sys.argv) > 2 else 100000
+    os.chdir(tempfile.mkdtemp())
+    write_synthetic_events(count, word_count)
+
+    begin = perf_counter()
+    events = load_events()
+    loaded = perf_counter()
+    summary = summarize_events(events)
+    done = perf_counter()
+
+    print(f"记录数：{count}，单词数：{word_count}，日志大小：{os.path.getsize(EVENTS_PATH) / 1e6:.1f}MB")
+    print(f"读取：{loaded - begin:.3f}s，统计：{done - loaded:.3f}s，总计：{done - begin:.3f}s")
+    print(f"总体正确率：{summary['accuracy']:.1%}，最薄弱单词：{summary['weakest'][:3]}")
+
+
+if __name__ == '__main__':
+    main()
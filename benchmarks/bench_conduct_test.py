@@ -0,0 +1,107 @@
+"""
+单词测试基准测试：测量不同规模单词本的测试准备和答题循环耗时，并比较干扰项的选取方式。
+
+用法：
+    python benchmarks/bench_conduct_test.py [条目数 ...]
+
+默认测试 1000、10000、100000 个条目。对每种规模：
+1. 准备：生成单词本后，计时读取单词本及其词义投影（read_projection）
+2. 答题：计时 conduct_test 的完整循环（模式 1，每题直接跳过，不保存测试进度，输出重定向到空设备）
+3. 干扰项：比较原先在 deque 上 random.sample 与 sample_distractors 每题的平均耗时，
+   原方式每题 O(n)，只抽测前若干题
+"""
+
+import os
+import random
+import sys
+import tempfile
+from collections import deque
+from contextlib import redirect_stdout
+from os.path import dirname, abspath
+from time import perf_counter
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+
+import training
+from file_io import read_projection, write_words
+from training import conduct_test
+from quiz_engine import sample_distractors
+
+# 原方式最多抽测的题数
+OLD_SAMPLE_QUESTIONS = 200
+
+
+def make_book(count: int) -> tuple[list, list]:
+    """
+    生成测试用的单词和词义。
+    """
+    words = [f"word{i}" for i in range(count)]
+    meanings = [f"英 /w{i}/ 美 /w{i}/\nn. (Test) 词义{i}；释义{i}\nv. 动作{i}（act）\n" for i in range(count)]
+    return words, meanings
+
+
+def time_old_distractors(length: int) -> float:
+    """
+    原方式：题目索引放在 deque 中轮转，每题对整个 deque 调用 random.sample。
+
+    Returns:
+        float: 每题平均耗时（微秒）。
+    """
+    shuffled_indices = list(range(length))
+    random.shuffle(shuffled_indices)
+    shuffled_indices = deque(shuffled_indices)
+    questions = min(length, OLD_SAMPLE_QUESTIONS)
+    begin = perf_counter()
+    for _ in range(questions):
+        current_index = shuffled_indices[-1]
+        shuffled_indices.pop()
+        shuffled_indices.appendleft(current_index)
+        shuffled_indices.popleft()
+        random.sample(shuffled_indices, 3)
+        shuffled_indices.appendleft(current_index)
+    return (perf_counter() - begin) / questions * 1e6
+
+
+def time_new_distractors(length: int) -> float:
+    """
+    新方式：直接抽取序号并拒绝正确答案。
+
+    Returns:
+        float: 每题平均耗时（微秒）。
+    """
+    order = list(range(length))
+    random.shuffle(order)
+    begin = perf_counter()
+    for current_index in reversed(order):
+        sample_distractors(length, current_index)
+    return (perf_counter() - begin) / length * 1e6
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000]
+    os.chdir(tempfile.mkdtemp())
+
+    # 每题直接跳过，测试结束时不写错题本
+    training.scan_and_write_to_log = lambda prompt="": "0"
+    training.write_words = lambda *args, **kwargs: None
+
+    print(f"{'条目数':>10}{'准备(s)':>12}{'答题(s)':>12}{'原干扰项(us/题)':>20}{'新干扰项(us/题)':>20}")
+    for size in sizes:
+        words, meanings = make_book(size)
+        write_words(f"bench_{size}", words, meanings, False)
+
+        begin = perf_counter()
+        words, meanings, projections = read_projection(f"bench_{size}")
+        setup = perf_counter() - begin
+
+        with open(os.devnull, "w", encoding="utf-8") as devnull, redirect_stdout(devnull):
+            begin = perf_counter()
+            conduct_test(words, meanings, 1, projections, checkpoint=False)
+            run = perf_counter() - begin
+
+        print(f"{size:>10}{setup:>12.3f}{run:>12.3f}{time_old_distractors(size):>20.2f}"
+              f"{time_new_distractors(size):>20.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+网页解析基准测试：比较完整解析整个页面与只解析所需标签的耗时。
+
+用法：
+    python benchmarks/bench_html_extract.py [网页目录] [重复次数]
+
+网页目录中的每个 .html 文件视为一个已保存的有道词典单词页面，默认使用 benchmarks/pages，
+对每个页面分别用两种方式提取翻译，检查结果一致并输出平均耗时；结果不一致时以状态码 1 退出。
+"""
+
+import sys
+from os import listdir
+from os.path import dirname, join, abspath
+from time import perf_counter
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+
+from bs4 import BeautifulSoup
+
+from translate import HTML_PARSER, extract_translation
+
+
+def extract_translation_full_parse(html: str) -> str:
+    """
+    原有的提取方式：用 html.parser 解析整个页面后再查找标签。
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    translation_result = ""
+    for phonetic in soup.find_all("div", attrs={"class": "phone_con"}):
+        translation_result += phonetic.get_text() + "\n"
+    if not translation_result.strip():
+        translation_result += "?\n"
+    for meaning in soup.find_all("li", attrs={"class": "word-exp"}):
+        translation_result += meaning.get_text() + "\n"
+    return translation_result
+
+
+def time_per_call(function, html: str, repeat: int) -> float:
+    """
+    返回函数处理一个页面的平均耗时（毫秒）。
+    """
+    begin = perf_counter()
+    for _ in range(repeat):
+        function(html)
+    return (perf_counter() - begin) / repeat * 1000
+
+
+def main():
+    pages_dir = sys.argv[1] if len(sys.argv) > 1 else join(dirname(abspath(__file__)), "pages")
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+
+    pages = sorted(name for name in listdir(pages_dir) if name.endswith(".html"))
+    if not pages:
+        print("目录中没有 .html 文件。")
+        return
+
+    print(f"解析器：{HTML_PARSER}，重复次数：{repeat}")
+    print(f"{'页面':<40}{'完整解析(ms)':>14}{'定向解析(ms)':>14}{'加速比':>8}")
+    total_full = total_targeted = 0.0
+    mismatched = False
+    for name in pages:
+        with open(join(pages_dir, name), "r", encoding="utf-8") as file:
+            html = file.read()
+        if extract_translation(html) != extract_translation_full_parse(html):
+            print(f"{name}：两种方式的提取结果不一致！")
+            mismatched = True
+        full = time_per_call(extract_translation_full_parse, html, repeat)
+        targeted = time_per_call(extract_translation, html, repeat)
+        total_full += full
+        total_targeted += targeted
+        print(f"{name:<40}{full:>14.3f}{targeted:>14.3f}{full / targeted:>8.2f}")
+
+    print(f"{'平均':<40}{total_full / len(pages):>14.3f}{total_targeted / len(pages):>14.3f}"
+          f"{total_full / total_targeted:>8.2f}")
+    if mismatched:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
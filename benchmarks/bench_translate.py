@@ -0,0 +1,143 @@
+"""
+翻译模块压测：用本地回放服务器代替有道词典和百度汉语，比较缓存、连接池和并发对吞吐量的影响。
+
+用法：
+    python benchmarks/bench_translate.py [录制目录] [--words 数量] [--latency 毫秒]
+                                         [--error-rate 比例] [--workers 并发数]
+
+不指定录制目录时使用合成网页。依次测试以下配置下
+get_translation、reverse_translate 和 translate_with_synonyms 的吞吐量（次/秒）：
+1. 顺序请求，每次新建连接，不使用缓存
+2. 顺序请求，复用连接池，不使用缓存
+3. 并发请求，复用连接池，不使用缓存
+4. 并发请求，复用连接池，缓存已预热（只影响 get_translation）
+"""
+
+import argparse
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from os.path import dirname, join, abspath
+from time import perf_counter
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+
+from config import config
+import http_client
+import translate
+from translate import get_translation, reverse_translate, translate_with_synonyms
+from translation_cache import clear_translation_cache, close_translation_cache
+
+from replay_server import SYNTHETIC_MEANINGS, load_fixtures, start_server
+
+
+def collect_queries(fixtures: dict, count: int) -> tuple[list, list]:
+    """
+    从录制的网页中取出英文单词和汉语查询，不够时用合成的查询补足。
+
+    Args:
+        fixtures (dict): 查找键 -> 网页内容。
+        count (int): 每种查询的数量。
+
+    Returns:
+        tuple[list, list]: 英文单词列表和汉语列表。
+    """
+    english = []
+    chinese = []
+    for key in fixtures:
+        if not key.startswith("/result?word="):
+            continue
+        query = key[len("/result?word="):].split("&")[0]
+        (english if query.isascii() else chinese).append(query)
+    english += [f"word{i}" for i in range(count - len(english))]
+    chinese += [SYNTHETIC_MEANINGS[i % len(SYNTHETIC_MEANINGS)] + str(i) for i in range(count - len(chinese))]
+    return english[:count], chinese[:count]
+
+
+def run(function, items: list, workers: int, pooled: bool) -> float:
+    """
+    对每个查询调用一次 function，返回吞吐量（次/秒）。
+
+    Args:
+        function: 查询函数。
+        items (list): 查询列表。
+        workers (int): 并发数，为 1 时顺序请求。
+        pooled (bool): 是否复用连接池，否则每次请求后关闭连接。
+    """
+    def call(item):
+        try:
+            function(item)
+        except Exception as e:
+            print(f"查询 '{item}' 时出错：{e}")
+        if not pooled:
+            http_client.close_session()
+
+    # 清空本次运行中反向翻译的结果，避免不同配置之间互相复用
+    translate.reverse_translate_futures.clear()
+    begin = perf_counter()
+    if workers == 1:
+        for item in items:
+            call(item)
+    else:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            list(executor.map(call, items))
+    return len(items) / (perf_counter() - begin)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="翻译模块压测")
+    parser.add_argument("fixtures_dir", nargs="?", help="录制目录，不指定时使用合成网页")
+    parser.add_argument("--words", type=int, default=40, help="每种查询的数量")
+    parser.add_argument("--latency", type=float, default=50, help="回放服务器的平均延迟（毫秒）")
+    parser.add_argument("--error-rate", type=float, default=0, help="回放服务器返回 503 的比例")
+    parser.add_argument("--workers", type=int, default=8, help="并发请求时的并发数")
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(args.fixtures_dir) if args.fixtures_dir else {}
+    server, address = start_server(fixtures, latency=args.latency / 1000, jitter=args.latency / 5000,
+                                   error_rate=args.error_rate, synthesize=True)
+    english, chinese = collect_queries(fixtures, args.words)
+    # 同一汉语页面既用于反向翻译，也用于近义词查询
+    synonyms_queries = chinese[:max(1, args.words // 4)]
+
+    # 所有请求转到回放服务器，放开限速，只测量缓存、连接池和并发的影响
+    config["http_host_overrides"] = {"dict.youdao.com": address, "hanyu.baidu.com": address}
+    config["http_rate_limits"] = {"default": (1e6, 1e6)}
+    config["http_backoff_base"] = 0.01
+    config["http_pool_size"] = args.workers
+    config["synonym_workers"] = args.workers
+    config["translation_cache_path"] = join(tempfile.mkdtemp(), "bench_cache.sqlite3")
+    http_client.rate_limiters.clear()
+
+    print(f"回放地址：{address}，录制网页：{len(fixtures)}个，延迟：{args.latency}ms，"
+          f"错误率：{args.error_rate}，每种查询：{args.words}个")
+
+    scenarios = [
+        ("顺序 / 新建连接 / 无缓存", 1, False, False),
+        ("顺序 / 连接池 / 无缓存", 1, True, False),
+        (f"并发{args.workers} / 连接池 / 无缓存", args.workers, True, False),
+        (f"并发{args.workers} / 连接池 / 缓存已预热", args.workers, True, True),
+    ]
+    print(f"{'配置':<30}{'get_translation':>18}{'reverse_translate':>20}{'translate_with_synonyms':>26}")
+    for name, workers, pooled, cached in scenarios:
+        http_client.close_session()
+        config["translation_cache_enabled"] = cached
+        if cached:
+            clear_translation_cache()
+            run(get_translation, english, workers, pooled)
+        # 顺序请求时近义词查询内部也不并发
+        config["synonym_workers"] = workers
+        results = [
+            run(get_translation, english, workers, pooled),
+            run(reverse_translate, chinese, workers, pooled),
+            run(translate_with_synonyms, synonyms_queries, 1, pooled),
+        ]
+        print(f"{name:<30}{results[0]:>18.1f}{results[1]:>20.1f}{results[2]:>26.1f}")
+
+    close_translation_cache()
+    server.shutdown()
+    print(f"回放服务器请求统计：{server.stats}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,228 @@
+"""
+本地回放服务器：代替有道词典和百度汉语，回放录制的网页，用于不联网地测试和压测翻译模块。
+
+用法：
+    python benchmarks/replay_server.py <录制目录> [--port 端口] [--latency 毫秒] [--jitter 毫秒]
+                                       [--error-rate 比例] [--throttle-rate 比例] [--synthesize]
+
+录制目录由 config["http_record_dir"] 生成：正常使用程序时设置该项，每个成功请求的网页
+都会保存为一个 JSON 文件。回放时把 config["http_host_overrides"] 中的
+"dict.youdao.com" 和 "hanyu.baidu.com" 都指向本服务器的地址即可。
+
+服务器按请求的路径和查询参数查找录制的网页；找不到时返回 404，
+指定 --synthesize 时则按页面结构生成一个合成网页（没有录制文件时也能压测）。
+每个请求先等待 latency ± jitter 毫秒，再按 error-rate 返回 503、按 throttle-rate 返回 429。
+"""
+
+import argparse
+import json
+import random
+import sys
+from hashlib import sha1
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from os import listdir
+from os.path import join
+from threading import Lock, Thread
+from time import sleep
+from urllib.parse import parse_qs, unquote, urlsplit
+
+
+def get_request_key(target: str) -> str:
+    """
+    获取请求的查找键：解码后的路径和查询参数。
+
+    Args:
+        target (str): 网址或请求行中的路径（含查询参数）。
+
+    Returns:
+        str: 查找键。
+    """
+    parts = urlsplit(target)
+    return unquote(f"{parts.path}?{parts.query}")
+
+
+def load_fixtures(fixtures_dir: str) -> dict:
+    """
+    读取录制目录中的所有网页。
+
+    Args:
+        fixtures_dir (str): 录制目录。
+
+    Returns:
+        dict: 查找键 -> 网页内容。
+    """
+    fixtures = {}
+    for name in listdir(fixtures_dir):
+        if not name.endswith(".json"):
+            continue
+        with open(join(fixtures_dir, name), "r", encoding="utf-8") as file:
+            fixture = json.load(file)
+        fixtures[get_request_key(fixture["url"])] = fixture["body"]
+    return fixtures
+
+
+def pick_words(seed: str, pool: list, count: int) -> list:
+    """
+    按种子确定地从候选列表中选取若干项，同一请求每次生成相同的合成网页。
+    """
+    generator = random.Random(sha1(seed.encode("utf-8")).hexdigest())
+    return generator.sample(pool, count)
+
+
+SYNTHETIC_MEANINGS = ["苹果", "水果", "快速的", "学习", "单词", "测试", "文件", "翻译", "服务器", "回放", "请求", "结果"]
+SYNTHETIC_WORDS = ["apple", "fruit", "quick", "learn", "word", "test", "file", "translate", "server", "replay"]
+
+
+def synthesize_page(path: str, query: dict) -> str | None:
+    """
+    按有道词典、百度汉语的页面结构生成合成网页，只包含翻译模块会解析的标签。
+
+    Args:
+        path (str): 请求路径。
+        query (dict): 解析后的查询参数。
+
+    Returns:
+        str | None: 合成网页，无法识别的请求返回 None。
+    """
+    filler = "<div class='other'>" + "<p>placeholder</p>" * 200 + "</div>"
+    if path == "/result" and "word" in query:
+        word = query["word"][0]
+        if word.isascii():
+            # 英文单词页面：音标和词义
+            meanings = "".join(f"<li class='word-exp'>n. {meaning}</li>"
+                               for meaning in pick_words(word, SYNTHETIC_MEANINGS, 3))
+            return (f"<html><body>{filler}<div class='phone_con'>英 /{word}/ 美 /{word}/</div>"
+                    f"<ul>{meanings}</ul>{filler}</body></html>")
+        # 汉语页面：对应的英文单词链接
+        links = "".join(f"<a class='point'>{english}</a>" for english in pick_words(word, SYNTHETIC_WORDS, 3))
+        return f"<html><body>{filler}{links}{filler}</body></html>"
+    if path == "/s" and "wd" in query:
+        chinese = query["wd"][0]
+        synonyms = "\n".join(pick_words(chinese, SYNTHETIC_MEANINGS, 3))
+        return f"<html><body>{filler}<div class='block'>近义词\n{synonyms}\n</div>{filler}</body></html>"
+    return None
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    """
+    回放请求处理器，配置保存在所属服务器的属性中。
+    """
+
+    def do_GET(self):
+        server = self.server
+        delay = server.latency + random.uniform(-server.jitter, server.jitter)
+        if delay > 0:
+            sleep(delay)
+
+        with server.stats_lock:
+            server.stats["requests"] += 1
+
+        roll = random.random()
+        if roll < server.error_rate:
+            self.send_reply(503, "replay: injected error", "errors")
+            return
+        if roll < server.error_rate + server.throttle_rate:
+            self.send_reply(429, "replay: injected throttling", "throttled")
+            return
+
+        key = get_request_key(self.path)
+        body = server.fixtures.get(key)
+        if body is None and server.synthesize:
+            parts = urlsplit(key)
+            body = synthesize_page(parts.path, parse_qs(parts.query))
+        if body is None:
+            self.send_reply(404, f"replay: no fixture for {key}", "missing")
+            return
+        self.send_reply(200, body, "served")
+
+    def send_reply(self, status: int, body: str, counter: str) -> None:
+        """
+        发送响应并更新统计。
+        """
+        with self.server.stats_lock:
+            self.server.stats[counter] += 1
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        if status == 429:
+            self.send_header("Retry-After", "0")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        # 压测时不逐条输出访问日志
+        pass
+
+
+def make_server(fixtures: dict, port: int = 0, latency: float = 0.0, jitter: float = 0.0,
+                error_rate: float = 0.0, throttle_rate: float = 0.0,
+                synthesize: bool = False) -> ThreadingHTTPServer:
+    """
+    创建回放服务器。
+
+    Args:
+        fixtures (dict): load_fixtures 读取的网页。
+        port (int): 监听端口，为 0 时自动选择。
+        latency (float): 每个请求的平均延迟（秒）。
+        jitter (float): 延迟的随机波动范围（秒）。
+        error_rate (float): 返回 503 的比例。
+        throttle_rate (float): 返回 429 的比例。
+        synthesize (bool): 找不到录制网页时是否生成合成网页。
+
+    Returns:
+        ThreadingHTTPServer: 尚未开始运行的服务器。
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", port), ReplayHandler)
+    server.daemon_threads = True
+    server.fixtures = fixtures
+    server.latency = latency
+    server.jitter = jitter
+    server.error_rate = error_rate
+    server.throttle_rate = throttle_rate
+    server.synthesize = synthesize
+    server.stats = {"requests": 0, "served": 0, "missing": 0, "errors": 0, "throttled": 0}
+    server.stats_lock = Lock()
+    return server
+
+
+def start_server(*args, **kwargs) -> tuple[ThreadingHTTPServer, str]:
+    """
+    在后台线程中启动回放服务器，参数与 make_server 相同。
+
+    Returns:
+        tuple[ThreadingHTTPServer, str]: 服务器及其地址（如 "http://127.0.0.1:8765"）。
+    """
+    server = make_server(*args, **kwargs)
+    Thread(target=server.serve_forever, daemon=True).start()
+    host, port = server.server_address[:2]
+    return server, f"http://{host}:{port}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="回放录制的网页，代替有道词典和百度汉语。")
+    parser.add_argument("fixtures_dir", nargs="?", help="录制目录")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=50, help="平均延迟（毫秒）")
+    parser.add_argument("--jitter", type=float, default=0, help="延迟的随机波动范围（毫秒）")
+    parser.add_argument("--error-rate", type=float, default=0, help="返回 503 的比例")
+    parser.add_argument("--throttle-rate", type=float, default=0, help="返回 429 的比例")
+    parser.add_argument("--synthesize", action="store_true", help="找不到录制网页时生成合成网页")
+    args = parser.parse_args()
+
+    if not args.fixtures_dir and not args.synthesize:
+        print(__doc__)
+        return
+    fixtures = load_fixtures(args.fixtures_dir) if args.fixtures_dir else {}
+    server = make_server(fixtures, args.port, args.latency / 1000, args.jitter / 1000,
+                         args.error_rate, args.throttle_rate, args.synthesize)
+    print(f"已加载{len(fixtures)}个网页，回放地址：http://127.0.0.1:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\n请求统计：{server.stats}")
+        sys.exit(0)
+
+
+if __name__ == '__main__':
+    main()
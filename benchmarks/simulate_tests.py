@@ -0,0 +1,137 @@
+"""
+测试模拟器：不经过控制台，用模拟的答题者驱动 QuizEngine，测量每道题的引擎开销。
+
+用法：
+    python benchmarks/simulate_tests.py [--sizes 条目数 ...] [--questions 题数] [--hard-questions 题数]
+                                        [--accuracy 首次答对概率] [--max-us 每题上限]
+
+默认在 10000、100000 个条目的单词本上，每种测试模式模拟 100000 道题（条目数不足时重复开始新的测试），
+困难模式（近邻查找较慢）模拟 2000 道题。模拟的答题者首次作答以 --accuracy 的概率答对，
+否则随机答错，之后每次尝试有一半概率答对，偶尔直接跳过。
+给出 --max-us 时，普通模式（不含困难模式）任一项每题平均耗时超过该值则以状态码 1 退出，可用于发现性能退化。
+"""
+
+import argparse
+import random
+import sys
+from os.path import dirname, abspath
+from time import perf_counter
+
+sys.path.insert(0, dirname(dirname(abspath(__file__))))
+
+from book_projection import project_meaning
+from neighbor_index import NeighborIndex
+from quiz_engine import QuizEngine
+
+# 跳过题目的概率
+SKIP_RATE = 0.02
+
+
+def make_book(count: int) -> tuple[list, list, list]:
+    """
+    生成测试用的单词、词义和词义投影。单词和词义由随机字母、汉字组成，
+    使困难模式的近邻查找接近真实单词本的情况。
+    """
+    rng = random.Random(count)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    hanzi = [chr(code) for code in range(0x4E00, 0x4E00 + 3000)]
+    words = set()
+    while len(words) < count:
+        words.add("".join(rng.choices(letters, k=rng.randint(4, 12))))
+    words = sorted(words)
+
+    def make_sense():
+        return "".join(rng.choices(hanzi, k=rng.randint(2, 4)))
+
+    meanings = [f"英 /{word}/ 美 /{word}/\nn. {make_sense()}；{make_sense()}\nv. {make_sense()}\n" for word in words]
+    projections = [project_meaning(meaning) for meaning in meanings]
+    return words, meanings, projections
+
+
+def wrong_response(question: dict) -> int | str:
+    """
+    生成一个错误的回答。
+    """
+    if question["options"] is None:
+        return question["answer"] + "x"
+    return (question["answer"] + random.randrange(1, len(question["options"]))) % len(question["options"])
+
+
+def simulate(words: list, meanings: list, projections: list, test_mode: int, questions: int,
+             accuracy: float, hard: bool = False, neighbor_index: NeighborIndex | None = None) -> dict:
+    """
+    模拟答题，题目用完时开始新的测试，直到答满 questions 道题。
+
+    Returns:
+        dict: 包含 questions（题数）、answers（作答次数）、setup（建立测试的总耗时，秒）、
+            run（答题的总耗时，秒）和 accuracy（实际正确率）的字典。
+    """
+    setup = run = 0.0
+    answered = answers = right = 0
+    while answered < questions:
+        begin = perf_counter()
+        engine = QuizEngine(words, meanings, test_mode, projections, hard, neighbor_index)
+        setup += perf_counter() - begin
+
+        begin = perf_counter()
+        while answered < questions:
+            question = engine.next_question()
+            if question is None:
+                break
+            if random.random() < SKIP_RATE:
+                outcome = engine.skip()
+            else:
+                first_try = True
+                while True:
+                    correct = random.random() < (accuracy if first_try else 0.5)
+                    outcome = engine.answer(question["answer"] if correct else wrong_response(question))
+                    answers += 1
+                    first_try = False
+                    if outcome["done"]:
+                        break
+            answered += 1
+            right += outcome["correct"]
+        run += perf_counter() - begin
+    return {"questions": answered, "answers": answers, "setup": setup, "run": run, "accuracy": right / answered}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="用模拟的答题者驱动测试引擎，测量每道题的开销")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10000, 100000], help="单词本条目数")
+    parser.add_argument("--questions", type=int, default=100000, help="每种测试模式模拟的题数")
+    parser.add_argument("--hard-questions", type=int, default=2000, help="困难模式模拟的题数")
+    parser.add_argument("--accuracy", type=float, default=0.7, help="首次作答答对的概率")
+    parser.add_argument("--max-us", type=float, default=0, help="每题平均耗时上限（微秒），超过时以状态码 1 退出")
+    parser.add_argument("--seed", type=int, default=0, help="随机数种子")
+    args = parser.parse_args()
+    random.seed(args.seed)
+
+    slow = False
+    print(f"{'条目数':>10}{'模式':>12}{'题数':>10}{'建立(s)':>10}{'答题(s)':>10}{'us/题':>10}{'正确率':>10}")
+    for size in args.sizes:
+        words, meanings, projections = make_book(size)
+        begin = perf_counter()
+        neighbor_index = NeighborIndex(words, projections)
+        index_time = perf_counter() - begin
+
+        runs = [("单词到释义", 1, False, args.questions), ("释义到单词", 2, False, args.questions),
+                ("释义到默写", 3, False, args.questions), ("困难模式1", 1, True, args.hard_questions),
+                ("困难模式2", 2, True, args.hard_questions)]
+        for name, test_mode, hard, questions in runs:
+            if questions <= 0:
+                continue
+            result = simulate(words, meanings, projections, test_mode, questions, args.accuracy,
+                              hard, neighbor_index if hard else None)
+            per_question = result["run"] / result["questions"] * 1e6
+            slow = slow or (not hard and args.max_us > 0 and per_question > args.max_us)
+            print(f"{size:>10}{name:>12}{result['questions']:>10}{result['setup']:>10.3f}{result['run']:>10.3f}"
+                  f"{per_question:>10.2f}{result['accuracy']:>10.1%}")
+        print(f"{size:>10}{'近邻索引':>12}{'':>10}{index_time:>10.3f}")
+
+    if slow:
+        print(f"每题平均耗时超过 {args.max_us}us！")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
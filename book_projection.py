@@ -0,0 +1,142 @@
+"""
+词义投影模块：为每个单词本保存测试时直接使用的预处理结果，避免每次测试都重新处理全部词义。
+
+投影文件 <name>$proj.json 与单词本放在一起，每个条目保存：
+    [过滤后的词义（filter_meanings）, 分割后的词义列表, 英式音标, 美式音标]
+投影在读取单词本（file_io.read_projection）时按需生成，写入单词本时不做处理，
+追加单词仍只需写入新增的内容。投影记录生成时单词本辅助文件的修改时间、大小和内容哈希：
+1. 修改时间和大小一致时直接使用
+2. 不一致，但辅助文件开头与投影对应的部分内容哈希一致（只在末尾追加了条目，或文件被复制）时，
+   只为新增的条目生成投影
+3. 否则为全部条目重新生成
+只有测试、复习等需要投影的单词本才会生成投影文件，去重、复制等产生的临时单词本不会生成；
+建立词义索引（file_io.refresh_meaning_index）时只复用已有的投影文件，不会为此生成。
+"""
+
+import json
+from hashlib import sha256
+from os import replace
+
+from utils import filter_meanings, split_filtered_meanings, parse_pron
+
+PROJECTION_VERSION = 1
+
+
+def get_projection_path(file_name: str) -> str:
+    """
+    获取单词本的投影文件路径。
+
+    Args:
+        file_name (str): 单词本文件名。
+
+    Returns:
+        str: 投影文件路径。
+    """
+    return f"{file_name}$proj.json"
+
+
+def get_book_digests(file_name: str, prefix_size: int) -> tuple[str, str]:
+    """
+    一次读取计算单词本辅助文件开头 prefix_size 字节和全部内容的 SHA-256。
+
+    Args:
+        file_name (str): 单词本文件名。
+        prefix_size (int): 开头部分的字节数。
+
+    Returns:
+        tuple[str, str]: 开头部分和全部内容的十六进制哈希值，文件不足 prefix_size 字节时前者为空字符串。
+    """
+    digest = sha256()
+    prefix_digest = ""
+    read_size = 0
+    with open(f"{file_name}$.txt", "rb") as file:
+        for block in iter(lambda: file.read(1 << 16), b""):
+            if read_size <= prefix_size < read_size + len(block):
+                digest.update(block[:prefix_size - read_size])
+                prefix_digest = digest.hexdigest()
+                digest.update(block[prefix_size - read_size:])
+            else:
+                digest.update(block)
+            read_size += len(block)
+    if read_size == prefix_size:
+        prefix_digest = digest.hexdigest()
+    return prefix_digest, digest.hexdigest()
+
+
+def project_meaning(meaning: str) -> list:
+    """
+    生成一个条目的投影。
+
+    Args:
+        meaning (str): 原始词义（第一行为音标）。
+
+    Returns:
+        list: [过滤后的词义, 分割后的词义列表, 英式音标, 美式音标（没有时为 None）]。
+    """
+    filtered = filter_meanings(meaning)
+    uk_pron, us_pron = parse_pron(meaning.split("\n")[0])
+    return [filtered, split_filtered_meanings(filtered), uk_pron, us_pron]
+
+
+def save_projection(file_name: str, entries: list, stamp: tuple, digest: str) -> None:
+    """
+    保存单词本的投影。
+
+    Args:
+        file_name (str): 单词本文件名。
+        entries (list): 各条目的投影。
+        stamp (tuple): 单词本辅助文件的 (修改时间, 文件大小)。
+        digest (str): 单词本辅助文件内容的哈希值。
+    """
+    path = get_projection_path(file_name)
+    projection = {"version": PROJECTION_VERSION, "stamp": list(stamp), "hash": digest, "entries": entries}
+    with open(f"{path}.tmp", "w", encoding="utf-8") as file:
+        json.dump(projection, file, ensure_ascii=False, separators=(",", ":"))
+    replace(f"{path}.tmp", path)
+
+
+def load_projection(file_name: str) -> dict | None:
+    """
+    读取单词本的投影文件。
+
+    Args:
+        file_name (str): 单词本文件名。
+
+    Returns:
+        dict | None: 投影内容，文件不存在、损坏或版本不符时返回 None。
+    """
+    try:
+        with open(get_projection_path(file_name), "r", encoding="utf-8") as file:
+            projection = json.load(file)
+    except (OSError, ValueError):
+        return None
+    if projection.get("version") != PROJECTION_VERSION:
+        return None
+    return projection
+
+
+def refresh_projection(file_name: str, meanings: list, stamp: tuple) -> list:
+    """
+    获取与单词本当前内容一致的投影：投影未过期时直接使用，单词本只在末尾追加了条目时
+    只为新条目生成投影，否则全部重新生成；有变化时保存新的投影。
+
+    Args:
+        file_name (str): 单词本文件名。
+        meanings (list): 全部条目的词义。
+        stamp (tuple): 单词本辅助文件当前的 (修改时间, 文件大小)。
+
+    Returns:
+        list: 各条目的投影。
+    """
+    projection = load_projection(file_name)
+    entries = []
+    if projection is not None:
+        entries = projection["entries"]
+        if tuple(projection["stamp"]) == tuple(stamp) and len(entries) == len(meanings):
+            return entries
+    prefix_digest, digest = get_book_digests(file_name, projection["stamp"][1] if projection else 0)
+    if projection is None or prefix_digest != projection["hash"] or len(entries) > len(meanings):
+        entries = []
+    entries = entries + [project_meaning(meaning) for meaning in meanings[len(entries):]]
+    save_projection(file_name, entries, stamp, digest)
+    return entries
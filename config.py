@@ -15,5 +15,27 @@ config = {
     "wrong_select_means_hard": "",  # 错题本（词义选择，困难模式）
     "wrong_select_words": "",  # 错题本（英译汉）
     "wrong_dictation": "",  # 错题本（听写）
-    "default_line_length": 50
+    "default_line_length": 50,
+    "compact_interval": 50,  # 单词本每追加多少次后整理一次
+    "checkpoint_interval": 20,  # 测试中每答多少题保存一次进度，0 表示不保存
+    "merge_wrong_books": False,  # 测试结束时把错题增量合并进错题本（记录答错次数），否则覆盖错题本
+    "translation_cache_enabled": True,  # 是否使用本地翻译缓存
+    "translation_cache_path": "",  # 翻译缓存数据库路径，为空时使用基础路径下的 translation_cache.sqlite3
+    "translation_cache_ttl": 30 * 24 * 3600,  # 翻译结果的缓存时间（秒）
+    "translation_cache_negative_ttl": 24 * 3600,  # 查询失败结果的缓存时间（秒）
+    "translation_cache_max_entries": 200000,  # 翻译缓存最多保存的条目数
+    "http_timeout": (5, 15),  # 联网请求的连接、读取超时（秒）
+    "http_retries": 3,  # 请求失败（429、5xx、连接错误）时的最大重试次数
+    "http_backoff_base": 1.0,  # 重试的初始等待时间（秒），之后每次翻倍
+    "http_pool_size": 8,  # 每个主机保持的最大连接数
+    "http_record_dir": "",  # 不为空时，把每个成功请求的网页保存到该目录，供 benchmarks/replay_server.py 回放
+    "http_host_overrides": {},  # 主机替换：主机名 -> 替代地址（如 "http://127.0.0.1:8765"），用于连接本地回放服务器
+    "local_dictionary_path": "",  # 本地词典文件（CSV/TSV：单词、音标、词义）路径，为空时只联网查询
+    "translate_workers": 4,  # 批量查询翻译时的并发数（实际速率仍受各主机限速约束）
+    "synonym_workers": 4,  # 并发查询近义词翻译时的并发数
+    "http_rate_limits": {  # 各主机的请求速率：(每秒请求数, 最多积累的请求数)
+        "dict.youdao.com": (2.0, 4),
+        "hanyu.baidu.com": (1.0, 2),
+        "default": (1.0, 1),
+    }
 }
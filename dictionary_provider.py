@@ -0,0 +1,199 @@
+"""
+词典提供者模块：定义翻译查询的提供者接口，并实现基于本地词典文件的离线提供者。
+
+本地词典从 CSV/TSV 格式的词典文件（列依次为：单词、音标、词义）生成排序后的索引：
+    <词典文件>.dat：按规范化单词排序的记录，每条为 "单词\\0翻译结果"（UTF-8 编码）
+    <词典文件>.idx：文件头 + n+1 个定长偏移量，第 i 条记录位于 [offsets[i], offsets[i+1])
+两个文件通过 mmap 读取，查询时二分查找，不需要把整个词典读入内存。
+"""
+
+import csv
+import struct
+from abc import ABC, abstractmethod
+from os import fdopen, remove, replace, stat
+from os.path import abspath, basename, dirname, exists
+from tempfile import mkstemp
+
+from indexed_book import INDEX_HEADER, OFFSET, map_file, pack_index, read_header
+from word_format import normalize_word
+
+# 索引文件的魔数，文件头和偏移量的格式与索引单词本相同
+INDEX_MAGIC = b"LDI1"
+
+
+class TranslationProvider(ABC):
+    """
+    翻译提供者接口：lookup 返回与 get_translation 相同格式的翻译结果
+    （第一行为音标，其后每行一个词义），查不到时返回 None。
+    """
+
+    name = "provider"
+
+    @abstractmethod
+    def lookup(self, word: str, use_cache: bool = True) -> str | None:
+        """
+        查询单词的翻译结果。
+
+        Args:
+            word (str): 要查询的单词。
+            use_cache (bool): 是否可以使用翻译缓存。
+
+        Returns:
+            str | None: 翻译结果，查不到时返回 None。
+        """
+
+
+def format_translation(phonetics: str, meanings: list) -> str:
+    """
+    将音标和词义组合为 get_translation 的输出格式。
+
+    Args:
+        phonetics (str): 音标，为空时用 "?" 占位。
+        meanings (list): 词义列表。
+
+    Returns:
+        str: 第一行为音标、其后每行一个词义的翻译结果。
+    """
+    lines = [phonetics.strip() or "?"] + [meaning.strip() for meaning in meanings if meaning.strip()]
+    return "\n".join(lines) + "\n"
+
+
+def read_dictionary_rows(path: str):
+    """
+    逐行读取 CSV/TSV 词典文件。.tsv 和 .txt 文件按制表符分隔，其余按逗号分隔。
+    词义列中的换行或字面量 "\\n" 都视为多个词义的分隔。
+
+    Args:
+        path (str): 词典文件路径。
+
+    Yields:
+        tuple[str, str]: 规范化后的单词和翻译结果。
+    """
+    delimiter = "\t" if path.lower().endswith((".tsv", ".txt")) else ","
+    with open(path, "r", encoding="utf-8", newline="") as file:
+        for i, row in enumerate(csv.reader(file, delimiter=delimiter)):
+            if not row or not row[0].strip():
+                continue
+            # 跳过表头
+            if i == 0 and row[0].strip().lower() == "word":
+                continue
+            word = row[0]
+            phonetics = row[1] if len(row) > 1 else ""
+            meanings = row[2].replace("\\n", "\n").split("\n") if len(row) > 2 else []
+            yield normalize_word(word), format_translation(phonetics, meanings)
+
+
+def build_local_dictionary(path: str) -> int:
+    """
+    从词典文件生成排序后的数据文件和偏移索引，同一单词只保留第一次出现的记录。
+
+    Args:
+        path (str): 词典文件路径。
+
+    Returns:
+        int: 索引中的单词数。
+    """
+    records = {}
+    for key, translation in read_dictionary_rows(path):
+        key = key.encode("utf-8")
+        if key and key not in records:
+            records[key] = translation.encode("utf-8")
+
+    # 临时文件名各不相同，同时生成索引时不会互相覆盖
+    folder = dirname(abspath(path))
+    temp_paths = []
+    try:
+        offsets = [0]
+        data_fd, data_tmp = mkstemp(prefix=f"{basename(path)}.", suffix=".dat.tmp", dir=folder)
+        temp_paths.append(data_tmp)
+        with fdopen(data_fd, "wb") as data_file:
+            position = 0
+            for key in sorted(records):
+                record = key + b"\0" + records[key]
+                data_file.write(record)
+                position += len(record)
+                offsets.append(position)
+
+        source_stat = stat(path)
+        index_fd, index_tmp = mkstemp(prefix=f"{basename(path)}.", suffix=".idx.tmp", dir=folder)
+        temp_paths.append(index_tmp)
+        with fdopen(index_fd, "wb") as index_file:
+            index_file.write(pack_index(INDEX_MAGIC, len(records), source_stat.st_mtime_ns, source_stat.st_size, offsets))
+
+        replace(data_tmp, f"{path}.dat")
+        replace(index_tmp, f"{path}.idx")
+    finally:
+        # 出错时删除留下的临时文件
+        for temp_path in temp_paths:
+            if exists(temp_path):
+                remove(temp_path)
+    return len(records)
+
+
+def is_index_fresh(path: str) -> bool:
+    """
+    检查词典索引是否存在且与词典文件一致。
+
+    Args:
+        path (str): 词典文件路径。
+
+    Returns:
+        bool: 索引可以直接使用时返回 True。
+    """
+    if not exists(f"{path}.dat"):
+        return False
+    header = read_header(f"{path}.idx", INDEX_MAGIC)
+    if header is None:
+        return False
+    _, source_mtime_ns, source_size = header
+    # 只有索引而没有原始词典文件时也可以使用
+    if not exists(path):
+        return True
+    source_stat = stat(path)
+    return (source_mtime_ns, source_size) == (source_stat.st_mtime_ns, source_stat.st_size)
+
+
+class LocalDictionaryProvider(TranslationProvider):
+    """
+    本地词典提供者：在排序后的内存映射索引上二分查找，单次查询 O(log n)。
+    """
+
+    name = "local"
+
+    def __init__(self, path: str):
+        if not is_index_fresh(path):
+            print(f"正在生成本地词典索引：{path}")
+            build_local_dictionary(path)
+        self.index = map_file(f"{path}.idx")
+        self.data = map_file(f"{path}.dat")
+        _, self.count, _, _ = INDEX_HEADER.unpack_from(self.index, 0)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def get_record(self, i: int) -> tuple[bytes, int, int]:
+        """
+        读取第 i 条记录的单词及翻译结果所在的位置。
+
+        Returns:
+            tuple[bytes, int, int]: 单词、翻译结果的起止位置。
+        """
+        begin, end = struct.unpack_from("<2Q", self.index, INDEX_HEADER.size + i * OFFSET.size)
+        separator = self.data.find(b"\0", begin, end)
+        return self.data[begin:separator], separator + 1, end
+
+    def lookup(self, word: str, use_cache: bool = True) -> str | None:
+        key = normalize_word(word).encode("utf-8")
+        low, high = 0, self.count
+        while low < high:
+            middle = (low + high) // 2
+            if self.get_record(middle)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low == self.count:
+            return None
+        record_key, begin, end = self.get_record(low)
+        if record_key != key:
+            return None
+        return self.data[begin:end].decode("utf-8")
@@ -2,40 +2,76 @@
 文件操作模块：提供与文件读写相关的功能，包括创建文件、读取和写入单词本等。
 """
 
-from os import listdir, chdir, mkdir
-from os.path import join, abspath
+from os import listdir, chdir, mkdir, stat, replace, fsync
+from os.path import join, abspath, exists
 from time import time, strftime, localtime, sleep
-import re
 
 from config import config
-from utils import scan_and_write_to_log, get_file_name_by_index, remove_duplicates
+from utils import scan_and_write_to_log, get_file_name_by_index, remove_duplicates, merge_duplicate_words
+from indexed_book import build_indexed_book, open_indexed_book, read_index_header, append_indexed_book
+from word_format import CHUNK_SIZE, FORMAT_MARKER, FORMAT_VERSION, format_entries, iter_entries, parse_legacy_entries
+from backup_store import save_snapshot, list_snapshots, load_snapshot
+from meaning_index import index_entries, index_translation_cache, update_source, drop_source, get_source_stamp
+from book_projection import get_projection_path, refresh_projection
 
+# 各单词本自上次整理以来的追加次数
+append_counts = {}
 
-def create_text_file(file_name: str) -> None:
+# 已原子替换但尚未同步到磁盘的文件路径
+pending_fsync_paths = set()
+
+# 工作区文件清单：文件夹绝对路径 -> {"mtime": 文件夹修改时间, "names": 文件名集合, "lower_names": 小写文件名 -> 文件名}
+workspace_manifests = {}
+
+# 单词本读取缓存：辅助文件绝对路径 -> (修改时间, 文件大小, 单词列表, 词义列表)
+words_cache = {}
+# 单词本读取缓存的命中统计
+words_cache_stats = {"hits": 0, "misses": 0}
+
+
+def get_workspace_manifest(folder: str = ".") -> dict:
     """
-    创建一个空的文本文件，如果文件已存在则不操作。
+    获取文件夹的文件清单。清单按文件夹缓存，文件夹修改时间变化（增删、重命名文件）后才重新扫描。
 
     Args:
-        file_name (str): 要创建的文件名。
+        folder (str): 文件夹路径，默认为当前目录。
+
+    Returns:
+        dict: 包含文件名集合 names 和小写文件名映射 lower_names 的清单。
     """
-    # 获取当前目录下的文件列表
-    existing_files = listdir()
+    folder = abspath(folder)
+    mtime = stat(folder).st_mtime_ns
+    manifest = workspace_manifests.get(folder)
+    if manifest is None or manifest["mtime"] != mtime:
+        names = listdir(folder)
+        manifest = {
+            "mtime": mtime,
+            "names": set(names),
+            "lower_names": {name.lower(): name for name in names},
+        }
+        workspace_manifests[folder] = manifest
+    return manifest
+
+
+def find_case_conflict(file_name: str) -> str | None:
+    """
+    检查文件名是否与当前目录中已有的文件只有大小写不同。
 
-    # 如果文件已存在，直接返回
-    if file_name in existing_files:
-        return
-    elif file_name.lower() in [s0.lower() for s0 in existing_files]:
-        print("警告：存在大小写冲突，跳过文件的创建")
-        return
+    Args:
+        file_name (str): 文件名。
 
-    # 创建新文件并写入空内容
-    with open(file_name, "a", encoding="utf-8") as file:
-        file.write("")
+    Returns:
+        str | None: 冲突的已有文件名，没有冲突时返回 None。
+    """
+    manifest = get_workspace_manifest()
+    if file_name in manifest["names"]:
+        return None
+    return manifest["lower_names"].get(file_name.lower())
 
 
 def initialize_files() -> None:
     """
-    初始化单词本文件夹和文件，根据用户输入创建必要的目录和文件。
+    初始化单词本文件夹和文件名，根据用户输入创建目录，单词本文件在第一次写入时创建。
     """
     # 切换到基础路径
     chdir(config["base_path"])
@@ -64,8 +100,56 @@ def initialize_files() -> None:
     # 切换到新创建的文件夹
     chdir(join(abspath("."), config["folder_name"]))
 
-    # 创建单词本文件
-    file_names = [
+    # 旧版本写入的单词本先转换为当前格式
+    migrate_legacy_books()
+
+    # 检查单词本文件，缺失的文件在第一次写入时自动创建
+    conflicts = []
+    for file_name in get_book_names():
+        for path in (f"{file_name}.txt", f"{file_name}$.txt"):
+            conflict = find_case_conflict(path)
+            if conflict:
+                conflicts.append(f"{path}（已有 {conflict}）")
+
+    # 大小写冲突只在启动时统一提示一次
+    if conflicts:
+        print("警告：以下文件存在大小写冲突：\n" + "\n".join(conflicts))
+
+
+def migrate_legacy_books() -> None:
+    """
+    将当前文件夹中旧版本写入（不转义）的辅助文件按旧格式读取并重写为当前格式，只执行一次，
+    完成后在 FORMAT_MARKER 文件中记录格式版本。不含反斜杠的旧文件两种格式的解析结果相同，不需要重写。
+    """
+    if exists(FORMAT_MARKER):
+        return
+    migrated = []
+    for name in sorted(listdir(".")):
+        if not name.endswith("$.txt"):
+            continue
+        with open(name, "r", encoding="utf-8") as file:
+            content = file.read()
+        if "\\" not in content:
+            continue
+        file_name = name[:-len("$.txt")]
+        words, meanings = parse_legacy_entries(content)
+        write_entries(file_name, words, meanings, "w", sync=True)
+        migrated.append(file_name)
+
+    with open(FORMAT_MARKER, "w", encoding="utf-8") as file:
+        file.write(f"{FORMAT_VERSION}\n")
+    if migrated:
+        print(f"已将{len(migrated)}个旧格式的单词本转换为新格式：{'、'.join(migrated)}")
+
+
+def get_book_names() -> list:
+    """
+    获取配置中的单词本和错题本文件名（由 initialize_files 生成）。
+
+    Returns:
+        list: 文件名列表，尚未初始化的为空字符串。
+    """
+    return [
         config["words_txt_name"],
         config["wrong_select_means"],
         config["wrong_select_means_hard"],
@@ -74,65 +158,350 @@ def initialize_files() -> None:
         config["words_temp_txt_name"],
         config["words_ebbinghaus_txt_name"],
     ]
-    for file_name in file_names:
-        create_text_file(f"{file_name}.txt")
-        create_text_file(f"{file_name}$" ".txt")
 
 
-def read_words(file_name: str) -> tuple[list, list]:
+def read_words(file_name: str, lazy: bool = False) -> tuple[list, list]:
     """
     从指定的文件中读取单词和词义。
+    解析结果按文件路径、修改时间和大小缓存，文件未变化时直接返回缓存内容的副本。
 
     Args:
         file_name (str): 文件名。
+        lazy (bool): 是否以索引单词本的形式按需读取，只读取被访问的条目。
 
     Returns:
-        tuple[list, list]: 单词列表和词义列表。
+        tuple[list, list]: 单词列表和词义列表，lazy 为 True 时为只读的类列表视图。
     """
-    # 读取文件内容
-    with open(f"{file_name}$.txt", "r", encoding="utf-8") as file:
-        content = file.read().split("$")
+    if lazy:
+        book = read_indexed_words(file_name)
+        if book is None:
+            return [], []
+        return book.words, book.meanings
+
+    path = abspath(f"{file_name}$.txt")
+    try:
+        file_stat = stat(path)
+    except FileNotFoundError:
+        # 单词本尚未写入过，视为空单词本
+        return [], []
 
-    # 解析单词和词义
+    # 文件未变化时直接使用缓存（返回副本，调用方可以随意修改）
+    cached = lookup_words_cache(path, file_stat)
+    if cached is not None:
+        return list(cached[0]), list(cached[1])
+
+    # 流式解析单词和词义
     words = []
     meanings = []
-    for i in range(len(content) // 2):
-        words.append(content[2 * i].strip())
-        meanings.append(content[2 * i + 1])
+    for word, meaning in iter_words(file_name):
+        words.append(word)
+        meanings.append(meaning)
+
+    words_cache[path] = (file_stat.st_mtime_ns, file_stat.st_size, words, meanings)
+    return list(words), list(meanings)
+
+
+def lookup_words_cache(path: str, file_stat) -> tuple[list, list] | None:
+    """
+    查找单词本的读取缓存并记录命中统计。
 
-    # 利用re分别去掉words中元素的开头和结尾的特殊符号
-    words = [re.sub(r'^\W+|\W+$', '', word) for word in words]
+    Args:
+        path (str): 辅助文件的绝对路径。
+        file_stat: 辅助文件当前的 stat 结果。
+
+    Returns:
+        tuple[list, list] | None: 缓存的单词列表和词义列表（不是副本），未缓存或文件已变化时返回 None。
+    """
+    cached = words_cache.get(path)
+    if cached and cached[0] == file_stat.st_mtime_ns and cached[1] == file_stat.st_size:
+        words_cache_stats["hits"] += 1
+        return cached[2], cached[3]
+    words_cache_stats["misses"] += 1
+    return None
 
-    return words, meanings
+
+def get_cached_words(file_name: str) -> tuple[list, list] | None:
+    """
+    获取单词本已缓存的解析结果，不读取文件内容。返回的是缓存本身，调用方不能修改。
+
+    Args:
+        file_name (str): 文件名。
+
+    Returns:
+        tuple[list, list] | None: 单词列表和词义列表，单词本尚未写入过时为两个空列表；
+            未缓存或文件已变化时返回 None，调用方可改用 iter_words 流式读取。
+    """
+    path = abspath(f"{file_name}$.txt")
+    try:
+        file_stat = stat(path)
+    except FileNotFoundError:
+        return [], []
+    return lookup_words_cache(path, file_stat)
+
+
+def iter_words(file_name: str):
+    """
+    按块流式读取单词本，逐个产生 (单词, 词义)，不会一次性读入整个文件。
+
+    Args:
+        file_name (str): 文件名。
+
+    Yields:
+        tuple[str, str]: 单词和词义。
+    """
+    # 单词本尚未写入过，视为空单词本
+    if not exists(f"{file_name}$.txt"):
+        return
+    with open(f"{file_name}$.txt", "r", encoding="utf-8") as file:
+        yield from iter_entries(iter(lambda: file.read(CHUNK_SIZE), ""))
+
+
+def read_indexed_words(file_name: str):
+    """
+    打开单词本对应的索引单词本，索引不存在或已落后于文本文件时先重新生成。
+    通过程序追加或改写的单词本会同时更新已有的索引（见 write_entries），不需要重新生成。
+
+    Args:
+        file_name (str): 文件名。
+
+    Returns:
+        IndexedWordBook | None: 可按序号随机访问的索引单词本，单词本尚未写入过时返回 None。
+    """
+    header = read_index_header(file_name)
+    if exists(f"{file_name}$.txt"):
+        file_stat = stat(f"{file_name}$.txt")
+        if header is None or header[1:] != (file_stat.st_mtime_ns, file_stat.st_size):
+            convert_text_to_indexed(file_name)
+    elif header is None:
+        return None
+    return open_indexed_book(file_name)
+
+
+def convert_text_to_indexed(file_name: str) -> None:
+    """
+    将文本格式的单词本转换为索引单词本（<name>$.wbd 和 <name>$.wbi）。
+
+    Args:
+        file_name (str): 文件名。
+    """
+    file_stat = stat(f"{file_name}$.txt")
+    words, meanings = read_words(file_name)
+    build_indexed_book(file_name, words, meanings, file_stat.st_mtime_ns, file_stat.st_size)
+
+
+def convert_indexed_to_text(file_name: str) -> None:
+    """
+    将索引单词本转换回文本格式的单词本，并使索引与新的文本文件保持一致。
+
+    Args:
+        file_name (str): 文件名。
+    """
+    book = open_indexed_book(file_name)
+    words = list(book.words)
+    meanings = list(book.meanings)
+    write_words(file_name, words, meanings, False)
+    convert_text_to_indexed(file_name)
+
+
+def convert_text_to_indexed_by_index(file_index: int) -> None:
+    convert_text_to_indexed(get_file_name_by_index(file_index))
+    print("已生成索引单词本。")
+
+def convert_indexed_to_text_by_index(file_index: int) -> None:
+    file_name = get_file_name_by_index(file_index)
+    if read_index_header(file_name) is None:
+        print("该单词本没有索引单词本！")
+        return
+    convert_indexed_to_text(file_name)
+    print("已将索引单词本转换为文本单词本。")
+
+
+def get_file_stamp(file_name: str) -> tuple | None:
+    """
+    获取单词本辅助文件的修改时间和大小。
+
+    Args:
+        file_name (str): 文件名。
+
+    Returns:
+        tuple | None: (修改时间, 文件大小)，文件不存在时返回 None。
+    """
+    try:
+        file_stat = stat(f"{file_name}$.txt")
+    except FileNotFoundError:
+        return None
+    return file_stat.st_mtime_ns, file_stat.st_size
+
+
+def read_projection(file_name: str) -> tuple[list, list, list]:
+    """
+    读取单词本及其词义投影（过滤后的词义、分割后的词义、英式和美式音标），
+    投影过期或不存在时重新生成（单词本只追加了条目时只为新条目生成）。
+
+    Args:
+        file_name (str): 文件名。
+
+    Returns:
+        tuple[list, list, list]: 单词列表、词义列表和与之一一对应的投影列表。
+    """
+    words, meanings = read_words(file_name)
+    stamp = get_file_stamp(file_name)
+    if stamp is None:
+        return words, meanings, []
+    return words, meanings, refresh_projection(file_name, meanings, stamp)
+
+
+def refresh_meaning_index() -> None:
+    """
+    为配置中的单词本、错题本（见 get_book_names）及翻译缓存建立词义索引，
+    备份、去重结果等其他文件不参与索引；已建立索引且未在程序外被修改的单词本不会重新读取。
+    已有投影文件的单词本直接使用投影中分割好的词义，其余单词本逐条分割，不会为此生成投影文件。
+    """
+    for file_name in get_book_names():
+        if not file_name:
+            continue
+        stamp = get_file_stamp(file_name)
+        if stamp is None or stamp == get_source_stamp(file_name):
+            continue
+        if exists(get_projection_path(file_name)):
+            words, meanings, projections = read_projection(file_name)
+            index_entries(file_name, words, meanings, stamp, senses=[entry[1] for entry in projections])
+        else:
+            words, meanings = read_words(file_name)
+            index_entries(file_name, words, meanings, stamp)
+    index_translation_cache()
+
+
+def invalidate_words_cache(file_name: str) -> None:
+    """
+    使指定单词本的读取缓存失效，在写入单词本后调用。
+
+    Args:
+        file_name (str): 文件名。
+    """
+    words_cache.pop(abspath(f"{file_name}$.txt"), None)
+
+
+def get_words_cache_stats() -> dict:
+    """
+    获取单词本读取缓存的命中统计。
+
+    Returns:
+        dict: 包含命中次数 hits、未命中次数 misses 和已缓存单词本数 cached 的字典。
+    """
+    return {**words_cache_stats, "cached": len(words_cache)}
+
+
+def show_words_cache_stats() -> None:
+    """
+    输出单词本读取缓存的命中统计。
+    """
+    stats = get_words_cache_stats()
+    total = stats["hits"] + stats["misses"]
+    hit_rate = f"{stats['hits'] / total:.1%}" if total else "无"
+    print(f"读取单词本{total}次，命中缓存{stats['hits']}次，未命中{stats['misses']}次，"
+          f"命中率：{hit_rate}，已缓存{stats['cached']}个单词本")
+
+
+def write_entries(file_name: str, words: list, meanings: list, mode: str, sync: bool = False) -> None:
+    """
+    将单词和词义一次性写入普通文件和辅助文件。
+    覆盖写入时先写临时文件再原子替换，写入中途出错也不会留下空的单词本。
+
+    Args:
+        file_name (str): 文件名。
+        words (list): 单词列表。
+        meanings (list): 词义列表。
+        mode (str): 写入模式，"a" 为追加，"w" 为覆盖。
+        sync (bool): 覆盖写入时是否立即同步到磁盘，否则延迟到 sync_pending_writes 统一同步。
+    """
+    invalidate_words_cache(file_name)
+
+    # 一次生成两种格式的内容
+    contents = {
+        f"{file_name}$.txt": format_entries(words, meanings),
+        f"{file_name}.txt": "".join(f"{word}：\n{meaning}\n\n" for word, meaning in zip(words, meanings)),
+    }
+
+    if mode == "a":
+        old_stamp = get_file_stamp(file_name)
+        for path, content in contents.items():
+            with open(path, "a", encoding="utf-8") as file:
+                file.write(content)
+        stamp = get_file_stamp(file_name)
+        update_source(file_name, words, meanings, stamp, append=True)
+        if old_stamp is not None:
+            append_indexed_book(file_name, words, meanings, old_stamp, stamp)
+        return
+
+    # 先完整写好两个临时文件，再依次替换（辅助文件优先，它是单词本的真实来源）
+    for path, content in contents.items():
+        with open(f"{path}.tmp", "w", encoding="utf-8") as file:
+            file.write(content)
+            if sync:
+                file.flush()
+                fsync(file.fileno())
+    for path in contents:
+        replace(f"{path}.tmp", path)
+        if not sync:
+            pending_fsync_paths.add(abspath(path))
+    stamp = get_file_stamp(file_name)
+    update_source(file_name, words, meanings, stamp)
+    # 已有索引单词本时一并重写（内容已在内存中），之后按需读取时不必重新解析文本文件
+    if read_index_header(file_name) is not None:
+        build_indexed_book(file_name, words, meanings, *stamp)
+
+
+def sync_pending_writes() -> None:
+    """
+    将延迟同步的单词本文件统一同步到磁盘，在程序退出前调用。
+    """
+    while pending_fsync_paths:
+        path = pending_fsync_paths.pop()
+        try:
+            with open(path, "ab") as file:
+                fsync(file.fileno())
+        except OSError:
+            pass
 
 
 def append_words(file_name: str, words: list, meanings: list) -> None:
     """
-    将单词和词义追加到指定的文件中。
+    将单词和词义追加到指定的文件中，只写入新增的内容，不重写整个文件。
+    每追加 config["compact_interval"] 次后自动整理一次文件。
 
     Args:
         file_name (str): 文件名。
         words (list): 单词列表。
         meanings (list): 词义列表。
     """
-    # 追加到普通文件
-    with open(f"{file_name}.txt", "a", encoding="utf-8") as file:
-        for word, meaning in zip(words, meanings):
-            file.write(f"{word}：\n{meaning}\n\n")
+    if not words:
+        return
 
-    # 追加到辅助文件
-    with open(f"{file_name}$.txt", "r", encoding="utf-8") as file:
-        content = file.read()
-    for word, meaning in zip(words, meanings):
-        content += f"{word.strip()}${meaning}$"
+    write_entries(file_name, words, meanings, "a")
 
-    with open(f"{file_name}$" ".txt", "w", encoding="utf-8") as file:
-        file.write(content)
+    # 记录追加次数，达到阈值后整理文件
+    append_counts[file_name] = append_counts.get(file_name, 0) + 1
+    if append_counts[file_name] >= config["compact_interval"]:
+        compact_words(file_name)
+
+
+def compact_words(file_name: str) -> None:
+    """
+    整理单词本：以辅助文件为准重写两个文件，去掉写入中断时留下的残缺条目，
+    并使普通文件与辅助文件的内容保持一致。
+
+    Args:
+        file_name (str): 文件名。
+    """
+    words, meanings = read_words(file_name)
+    write_words(file_name, words, meanings, False)
 
 
 def save_old_file(file_name: str) -> str:
     """
-    将当前文件的内容保存为一个新的备份文件，文件名包含时间戳。
+    将当前文件的内容保存为备份存储中的一个快照，快照以时间戳标识。
+    与上一次备份相同的内容不会重复保存。
 
     :args:
         file_name (str): 文件名。
@@ -142,17 +511,12 @@ def save_old_file(file_name: str) -> str:
     # 读取当前文件内容
     words, meanings = read_words(file_name)
 
-    # 生成备份文件名
+    # 生成时间戳
     time_us = (str(time()).split('.'))[1]
     timestamp = f"{strftime('%Y-%m-%d__%H_%M_%S', localtime())}.{time_us}"
-    backup_name = f"{file_name}_backed_up_at_{timestamp}"
-
-    # 创建备份文件
-    create_text_file(f"{backup_name}.txt")
-    create_text_file(f"{backup_name}$" ".txt")
 
-    # 将内容追加到备份文件
-    append_words(backup_name, words, meanings)
+    # 保存快照
+    save_snapshot(file_name, words, meanings, timestamp)
 
     sleep(0.001)
     return timestamp
@@ -160,15 +524,52 @@ def save_old_file(file_name: str) -> str:
 def save_old_file_by_index(file_index:int)->None:
     save_old_file(get_file_name_by_index(file_index))
 
-def write_words(file_name: str, words: list, meanings: list, user_call: bool = True) -> str:
+def list_backups(file_index: int) -> list:
+    """
+    列出指定单词本的所有备份。
+
+    Args:
+        file_index (int): 文件索引。
+
+    Returns:
+        list: 各备份的时间戳，按时间先后排序。
+    """
+    snapshots = list_snapshots(get_file_name_by_index(file_index))
+    if not snapshots:
+        print("该单词本没有备份。")
+    for i, snapshot in enumerate(snapshots, start=1):
+        print(f"{i} : {snapshot['timestamp']}  （{snapshot['count']}个单词）")
+    return [snapshot["timestamp"] for snapshot in snapshots]
+
+def restore_backup(file_index: int, backup_index: int) -> None:
+    """
+    将指定单词本恢复为某个备份，恢复前会先备份当前内容。
+
+    Args:
+        file_index (int): 文件索引。
+        backup_index (int): 备份序号（1-based，与 list_backups 的输出一致）。
+    """
+    file_name = get_file_name_by_index(file_index)
+    snapshots = list_snapshots(file_name)
+    if not 1 <= backup_index <= len(snapshots):
+        print(f"请输入1-{len(snapshots)}之间的备份序号！")
+        return
+    timestamp = snapshots[backup_index - 1]["timestamp"]
+    words, meanings = load_snapshot(file_name, timestamp)
+    write_words(file_name, words, meanings, True)
+    print(f"已恢复到{timestamp}的备份，共{len(words)}个单词。")
+
+def write_words(file_name: str, words: list, meanings: list, user_call: bool = True, sync: bool = False) -> str:
     """
     将单词和词义写入指定的文件中，可以选择是否保存旧文件。
+    新内容一次性写入临时文件后原子替换旧文件。
 
     :args:
         file_name (str): 文件名。
         words (list): 单词列表。
         meanings (list): 词义列表。
         user_call (bool): 是否由用户调用，如果是，则保存旧文件。
+        sync (bool): 是否立即同步到磁盘，否则延迟到 sync_pending_writes 统一同步。
     :returns:
         timestamp: 时间戳
     """
@@ -177,15 +578,9 @@ def write_words(file_name: str, words: list, meanings: list, user_call: bool = T
         # 如果由用户调用，先保存旧文件
         timestamp = save_old_file(file_name)
 
-    # 清空普通文件内容
-    with open(f"{file_name}.txt", "w", encoding="utf-8") as file:
-        file.write("")
-    # 清空辅助文件内容
-    with open(f"{file_name}$.txt", "w", encoding="utf-8") as file:
-        file.write("")
-
-    # 写入新内容
-    append_words(file_name, words, meanings)
+    # 覆盖写入新内容，文件已是完整状态，无需再整理
+    write_entries(file_name, words, meanings, "w", sync)
+    append_counts[file_name] = 0
     return timestamp
 
 
@@ -198,13 +593,20 @@ def add_word(file_name: str, word: str, meaning: str) -> None:
         word (str): 单词。
         meaning (str): 词义。
     """
+    invalidate_words_cache(file_name)
+    old_stamp = get_file_stamp(file_name)
+
     # 追加到普通文件
     with open(f"{file_name}.txt", "a", encoding="utf-8") as file:
         file.write(f"{word}：\n{meaning}\n\n")
 
     # 追加到辅助文件
     with open(f"{file_name}$" ".txt", "a", encoding="utf-8") as file:
-        file.write(f"{word}${meaning}$")
+        file.write(format_entries([word], [meaning]))
+    stamp = get_file_stamp(file_name)
+    update_source(file_name, [word], [meaning], stamp, append=True)
+    if old_stamp is not None:
+        append_indexed_book(file_name, [word], [meaning], old_stamp, stamp)
 
 
 def clear_words(file_name: str) -> None:
@@ -228,18 +630,23 @@ def clear_words(file_name: str) -> None:
     save_old_file(file_name)
 
     # 清空文件内容
+    invalidate_words_cache(file_name)
     with open(f"{file_name}.txt", "w", encoding="utf-8") as file:
         file.write("")
     with open(f"{file_name}$" ".txt", "w", encoding="utf-8") as file:
         file.write("")
+    drop_source(file_name)
 
 
-def remove_duplicates_from_file(file_index: int) -> None:
+def remove_duplicates_from_file(file_index: int, merge_by_word: bool = False, in_place: bool = False) -> None:
     """
     从指定的文件中移除重复的单词和词义。
 
     Args:
         file_index (int): 文件索引。
+        merge_by_word (bool): 是否按规范化后的单词去重（忽略大小写、空白和首尾符号），
+            并合并重复单词的不同词义；否则只去掉单词和词义完全相同的条目。
+        in_place (bool): 是否直接改写原单词本（改写前先备份），否则写入 <文件名>_del_re。
     """
     # 获取文件名
     file_name = get_file_name_by_index(file_index)
@@ -247,29 +654,29 @@ def remove_duplicates_from_file(file_index: int) -> None:
     # 读取文件内容
     words, meanings = read_words(file_name)
 
-    # 合并单词和词义为一个列表，用于去重
-    combined = [(words[i], meanings[i]) for i in range(len(words))]
-    unique_combined = remove_duplicates(combined)
+    if merge_by_word:
+        unique_words, unique_meanings = merge_duplicate_words(words, meanings)
+    else:
+        # 合并单词和词义为一个列表，用于去重
+        unique_combined = remove_duplicates(list(zip(words, meanings)))
 
-    # 分离去重后的单词和词义
-    unique_words = [item[0] for item in unique_combined]
-    unique_meanings = [item[1] for item in unique_combined]
+        # 分离去重后的单词和词义
+        unique_words = [item[0] for item in unique_combined]
+        unique_meanings = [item[1] for item in unique_combined]
 
-    # 生成新的文件名
-    new_file_name = f"{file_name}_del_re"
+    print(f"共{len(words)}个单词，去重后剩余{len(unique_words)}个。")
 
-    # 清空新文件内容
-    with open(f"{new_file_name}.txt", "w", encoding="utf-8") as file:
-        file.write("")
-    with open(f"{new_file_name}$.txt", "w", encoding="utf-8") as file:
-        file.write("")
-
-    # 将去重后的内容追加到新文件
-    append_words(new_file_name, unique_words, unique_meanings)
+    if in_place:
+        write_words(file_name, unique_words, unique_meanings, True)
+    else:
+        # 写入新的文件
+        write_words(f"{file_name}_del_re", unique_words, unique_meanings, False)
 
 def get_length_of_words(file_index:int):
-    words, _ = read_words(get_file_name_by_index(file_index))
-    length = len(words)
+    # 单词本已缓存时直接取长度，否则流式计数，不需要保存词义
+    file_name = get_file_name_by_index(file_index)
+    cached = get_cached_words(file_name)
+    length = len(cached[0]) if cached is not None else sum(1 for _ in iter_words(file_name))
     print(length)
 
     return length
\ No newline at end of file
@@ -0,0 +1,233 @@
+"""
+网络请求模块：提供共享的 HTTP 连接池、按主机的令牌桶限速、失败重试与超时。
+
+所有联网查询都通过 fetch 发起：
+1. 同一主机的请求复用 keep-alive 连接，不再每次重新建立 TCP/TLS 连接
+2. 每个主机一个令牌桶，请求速率由 config["http_rate_limits"] 配置
+3. 遇到 429 或 5xx 时按指数退避重试，并降低该主机的请求速率，之后逐步恢复
+4. 可以把请求到的网页录制到 config["http_record_dir"]，并通过 config["http_host_overrides"]
+   把请求转到本地回放服务器（benchmarks/replay_server.py），不联网地测试和压测翻译模块
+"""
+
+import json
+from hashlib import sha1
+from os import makedirs, replace
+from os.path import join
+from threading import Lock
+from time import monotonic, sleep
+from urllib.parse import urlparse, urlunparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from config import config
+
+# 共享的会话（首次使用时创建）及创建锁
+session = None
+session_lock = Lock()
+# 各主机的令牌桶：主机名 -> TokenBucket
+rate_limiters = {}
+rate_limiters_lock = Lock()
+
+
+class TokenBucket:
+    """
+    令牌桶限速器：令牌以 rate 个/秒的速度补充，最多积累 capacity 个，每个请求消耗一个令牌。
+    服务器限流时速率减半（不低于 min_rate），之后每次成功请求逐步恢复到初始速率。
+    """
+
+    def __init__(self, rate: float, capacity: float, min_rate: float = 0.1):
+        self.max_rate = rate
+        self.rate = rate
+        self.min_rate = min(min_rate, rate)
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = monotonic()
+        self.lock = Lock()
+
+    def acquire(self) -> None:
+        """
+        取得一个令牌，令牌不足时等待。
+        """
+        while True:
+            with self.lock:
+                now = monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            sleep(wait)
+
+    def slow_down(self) -> None:
+        """
+        服务器限流或出错时，将请求速率减半并清空积累的令牌。
+        """
+        with self.lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+            self.tokens = 0
+
+    def speed_up(self) -> None:
+        """
+        请求成功时，逐步恢复请求速率。
+        """
+        with self.lock:
+            self.rate = min(self.max_rate, self.rate + self.max_rate * 0.1)
+
+
+def get_session() -> requests.Session:
+    """
+    获取共享的 HTTP 会话，首次调用时创建连接池。
+
+    Returns:
+        requests.Session: 共享会话。
+    """
+    global session
+    with session_lock:
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=config["http_pool_size"])
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+    return session
+
+
+def close_session() -> None:
+    """
+    关闭共享的 HTTP 会话及其连接池，下次请求时重新创建。
+    """
+    global session
+    with session_lock:
+        if session is not None:
+            session.close()
+            session = None
+
+
+def apply_host_override(url: str) -> str:
+    """
+    按 config["http_host_overrides"] 替换网址的协议和主机，路径和查询参数保持不变。
+
+    Args:
+        url (str): 原网址。
+
+    Returns:
+        str: 实际请求的网址。
+    """
+    parsed = urlparse(url)
+    override = config["http_host_overrides"].get(parsed.hostname or "")
+    if not override:
+        return url
+    target = urlparse(override)
+    return urlunparse(parsed._replace(scheme=target.scheme, netloc=target.netloc))
+
+
+def get_fixture_name(url: str) -> str:
+    """
+    获取网址对应的录制文件名。
+
+    Args:
+        url (str): 原网址。
+
+    Returns:
+        str: 录制文件名。
+    """
+    return f"{sha1(url.encode('utf-8')).hexdigest()}.json"
+
+
+def record_fixture(url: str, text: str) -> None:
+    """
+    把请求到的网页保存到录制目录，文件内容为 {"url": 原网址, "body": 网页内容}。
+
+    Args:
+        url (str): 原网址。
+        text (str): 网页内容。
+    """
+    record_dir = config["http_record_dir"]
+    makedirs(record_dir, exist_ok=True)
+    path = join(record_dir, get_fixture_name(url))
+    with open(f"{path}.tmp", "w", encoding="utf-8") as file:
+        json.dump({"url": url, "body": text}, file, ensure_ascii=False)
+    replace(f"{path}.tmp", path)
+
+
+def get_rate_limiter(host: str) -> TokenBucket:
+    """
+    获取主机对应的令牌桶，未单独配置的主机使用 "default" 的配置。
+
+    Args:
+        host (str): 主机名。
+
+    Returns:
+        TokenBucket: 该主机的令牌桶。
+    """
+    with rate_limiters_lock:
+        limiter = rate_limiters.get(host)
+        if limiter is None:
+            limits = config["http_rate_limits"]
+            rate, capacity = limits.get(host, limits["default"])
+            limiter = TokenBucket(rate, capacity)
+            rate_limiters[host] = limiter
+    return limiter
+
+
+def get_retry_delay(response: requests.Response | None, attempt: int) -> float:
+    """
+    计算重试前的等待时间：优先使用服务器返回的 Retry-After，否则按指数退避。
+
+    Args:
+        response (requests.Response | None): 失败的响应，连接出错时为 None。
+        attempt (int): 已重试的次数（从 0 开始）。
+
+    Returns:
+        float: 等待秒数。
+    """
+    if response is not None:
+        retry_after = response.headers.get("Retry-After", "")
+        if retry_after.isdigit():
+            return float(retry_after)
+    return config["http_backoff_base"] * 2 ** attempt
+
+
+def fetch(url: str) -> str:
+    """
+    请求网页并返回内容，按主机限速，遇到 429、5xx 或连接错误时退避重试。
+    配置了主机替换时请求替代地址（限速仍按原主机），配置了录制目录时保存网页内容。
+
+    Args:
+        url (str): 网页地址。
+
+    Returns:
+        str: 网页内容。
+
+    Raises:
+        requests.RequestException: 重试次数用完后仍然失败。
+    """
+    limiter = get_rate_limiter(urlparse(url).hostname or "")
+    retries = config["http_retries"]
+    target = apply_host_override(url)
+
+    for attempt in range(retries + 1):
+        limiter.acquire()
+        try:
+            response = get_session().get(target, timeout=config["http_timeout"])
+        except (requests.ConnectionError, requests.Timeout):
+            if attempt == retries:
+                raise
+            limiter.slow_down()
+            sleep(get_retry_delay(None, attempt))
+            continue
+
+        if response.status_code == 429 or response.status_code >= 500:
+            if attempt == retries:
+                response.raise_for_status()
+            limiter.slow_down()
+            sleep(get_retry_delay(response, attempt))
+            continue
+
+        limiter.speed_up()
+        if config["http_record_dir"]:
+            record_fixture(url, response.text)
+        return response.text
+
+    raise requests.RequestException(f"请求失败：{url}")
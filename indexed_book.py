@@ -0,0 +1,291 @@
+"""
+索引单词本模块：提供带定长偏移索引的二进制单词本格式，支持按序号随机访问。
+
+一个索引单词本由两个文件组成：
+1. 数据文件 <name>$.wbd：依次存放每个条目的单词和词义（UTF-8 编码）
+2. 索引文件 <name>$.wbi：文件头 + 2n+1 个定长偏移量，
+   第 i 个条目的单词位于 [offsets[2i], offsets[2i+1])，词义位于 [offsets[2i+1], offsets[2i+2])
+
+两个文件均通过 mmap 读取，len() 和按序号取条目都是 O(1)，只有被访问的条目才会解码。
+文本单词本追加条目时，新条目也直接追加到两个文件末尾（append_indexed_book），不需要重新生成。
+索引文件的格式（pack_index、read_header、map_file）也用于本地词典的索引（见 dictionary_provider）。
+"""
+
+import mmap
+import struct
+from os import replace
+
+# 索引文件头：魔数、条目数、源文本文件的修改时间和大小
+INDEX_HEADER = struct.Struct("<4sQqQ")
+INDEX_MAGIC = b"WBI1"
+# 单个偏移量的格式
+OFFSET = struct.Struct("<Q")
+
+# 当前已打开的索引单词本：文件名 -> IndexedWordBook
+open_books = {}
+
+
+def get_indexed_paths(file_name: str) -> tuple[str, str]:
+    """
+    获取索引单词本的数据文件和索引文件路径。
+
+    Args:
+        file_name (str): 单词本文件名（不含扩展名）。
+
+    Returns:
+        tuple[str, str]: 数据文件路径和索引文件路径。
+    """
+    return f"{file_name}$.wbd", f"{file_name}$.wbi"
+
+
+def build_indexed_book(file_name: str, words: list, meanings: list,
+                       source_mtime_ns: int = 0, source_size: int = 0) -> None:
+    """
+    将单词和词义写成索引单词本，先写临时文件再替换，写入中断不会损坏旧文件。
+
+    Args:
+        file_name (str): 单词本文件名（不含扩展名）。
+        words (list): 单词列表。
+        meanings (list): 词义列表。
+        source_mtime_ns (int): 源文本文件的修改时间，用于判断索引是否过期。
+        source_size (int): 源文本文件的大小，用于判断索引是否过期。
+    """
+    data_path, index_path = get_indexed_paths(file_name)
+
+    # 关闭已打开的同名单词本，否则 Windows 下无法替换被映射的文件
+    close_indexed_book(file_name)
+
+    offsets = [0]
+    with open(f"{data_path}.tmp", "wb") as data_file:
+        position = 0
+        for word, meaning in zip(words, meanings):
+            for field in (word, meaning):
+                encoded = field.encode("utf-8")
+                data_file.write(encoded)
+                position += len(encoded)
+                offsets.append(position)
+
+    with open(f"{index_path}.tmp", "wb") as index_file:
+        index_file.write(pack_index(INDEX_MAGIC, (len(offsets) - 1) // 2, source_mtime_ns, source_size, offsets))
+
+    replace(f"{data_path}.tmp", data_path)
+    replace(f"{index_path}.tmp", index_path)
+
+
+def append_indexed_book(file_name: str, words: list, meanings: list, old_stamp: tuple, stamp: tuple) -> bool:
+    """
+    在索引单词本末尾追加条目。只有索引与追加前的文本文件一致时才追加，
+    否则不做处理，等下次按需读取时重新生成。
+    先追加数据和偏移量，最后改写文件头，写入中断时文件头仍与旧的文本文件对应，下次读取时会重新生成。
+
+    Args:
+        file_name (str): 单词本文件名（不含扩展名）。
+        words (list): 新追加的单词。
+        meanings (list): 新追加的词义。
+        old_stamp (tuple): 追加前文本文件的 (修改时间, 文件大小)。
+        stamp (tuple): 追加后文本文件的 (修改时间, 文件大小)。
+
+    Returns:
+        bool: 是否已追加。
+    """
+    header = read_index_header(file_name)
+    if header is None or tuple(header[1:]) != tuple(old_stamp):
+        return False
+    count = header[0]
+    data_path, index_path = get_indexed_paths(file_name)
+
+    # 关闭已打开的同名单词本，下次打开时重新映射追加后的文件
+    close_indexed_book(file_name)
+
+    with open(index_path, "r+b") as index_file:
+        index_file.seek(INDEX_HEADER.size + 2 * count * OFFSET.size)
+        position, = OFFSET.unpack(index_file.read(OFFSET.size))
+        offsets = []
+        with open(data_path, "ab") as data_file:
+            data_file.truncate(position)
+            for word, meaning in zip(words, meanings):
+                for field in (word, meaning):
+                    encoded = field.encode("utf-8")
+                    data_file.write(encoded)
+                    position += len(encoded)
+                    offsets.append(position)
+        index_file.seek(INDEX_HEADER.size + (2 * count + 1) * OFFSET.size)
+        index_file.truncate()
+        index_file.write(struct.pack(f"<{len(offsets)}Q", *offsets))
+        index_file.seek(0)
+        index_file.write(INDEX_HEADER.pack(INDEX_MAGIC, count + len(offsets) // 2, *stamp))
+    return True
+
+
+def pack_index(magic: bytes, count: int, source_mtime_ns: int, source_size: int, offsets: list) -> bytes:
+    """
+    生成索引文件的内容：文件头 + 定长偏移量。
+
+    Args:
+        magic (bytes): 4 字节魔数。
+        count (int): 条目数。
+        source_mtime_ns (int): 源文件的修改时间。
+        source_size (int): 源文件的大小。
+        offsets (list): 偏移量列表。
+
+    Returns:
+        bytes: 索引文件内容。
+    """
+    return INDEX_HEADER.pack(magic, count, source_mtime_ns, source_size) + struct.pack(f"<{len(offsets)}Q", *offsets)
+
+
+def read_header(index_path: str, magic: bytes) -> tuple[int, int, int] | None:
+    """
+    读取索引文件头并检查魔数。
+
+    Args:
+        index_path (str): 索引文件路径。
+        magic (bytes): 期望的 4 字节魔数。
+
+    Returns:
+        tuple[int, int, int] | None: 条目数、源文件修改时间和源文件大小，索引不存在或损坏时返回 None。
+    """
+    try:
+        with open(index_path, "rb") as index_file:
+            header = index_file.read(INDEX_HEADER.size)
+    except FileNotFoundError:
+        return None
+    if len(header) != INDEX_HEADER.size:
+        return None
+    header_magic, count, source_mtime_ns, source_size = INDEX_HEADER.unpack(header)
+    if header_magic != magic:
+        return None
+    return count, source_mtime_ns, source_size
+
+
+def read_index_header(file_name: str) -> tuple[int, int, int] | None:
+    """
+    读取索引单词本的文件头。
+
+    Args:
+        file_name (str): 单词本文件名（不含扩展名）。
+
+    Returns:
+        tuple[int, int, int] | None: 条目数、源文件修改时间和源文件大小，索引不存在或损坏时返回 None。
+    """
+    return read_header(get_indexed_paths(file_name)[1], INDEX_MAGIC)
+
+
+def open_indexed_book(file_name: str) -> "IndexedWordBook":
+    """
+    打开索引单词本，同一单词本重复打开时复用已有的映射。
+
+    Args:
+        file_name (str): 单词本文件名（不含扩展名）。
+
+    Returns:
+        IndexedWordBook: 索引单词本对象。
+    """
+    book = open_books.get(file_name)
+    if book is None:
+        book = IndexedWordBook(file_name)
+        open_books[file_name] = book
+    return book
+
+
+def close_indexed_book(file_name: str) -> None:
+    """
+    关闭已打开的索引单词本。
+
+    Args:
+        file_name (str): 单词本文件名（不含扩展名）。
+    """
+    book = open_books.pop(file_name, None)
+    if book is not None:
+        book.close()
+
+
+def map_file(path: str) -> mmap.mmap | bytes:
+    """
+    以只读方式映射文件，空文件无法映射，直接返回空字节串。
+
+    Args:
+        path (str): 文件路径。
+
+    Returns:
+        mmap.mmap | bytes: 文件的只读映射。
+    """
+    with open(path, "rb") as file:
+        try:
+            return mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return b""
+
+
+class IndexedWordBook:
+    """
+    索引单词本：类似序列的只读对象，book[i] 返回第 i 个条目的 (单词, 词义)。
+    """
+
+    def __init__(self, file_name: str):
+        data_path, index_path = get_indexed_paths(file_name)
+        self.file_name = file_name
+        self.data = map_file(data_path)
+        self.index = map_file(index_path)
+        magic, self.count, _, _ = INDEX_HEADER.unpack_from(self.index, 0)
+        if magic != INDEX_MAGIC:
+            raise ValueError(f"{index_path} 不是有效的索引文件")
+        self.words = BookColumn(self, 0)
+        self.meanings = BookColumn(self, 1)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def get_field(self, index: int, column: int) -> str:
+        """
+        读取并解码第 index 个条目的单词（column=0）或词义（column=1）。
+        """
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("单词本序号越界")
+        position = INDEX_HEADER.size + (2 * index + column) * OFFSET.size
+        begin, end = struct.unpack_from("<2Q", self.index, position)
+        return self.data[begin:end].decode("utf-8")
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.count))]
+        return self.get_field(index, 0), self.get_field(index, 1)
+
+    def __iter__(self):
+        for i in range(self.count):
+            yield self[i]
+
+    def close(self) -> None:
+        """
+        释放文件映射。
+        """
+        for mapped in (self.data, self.index):
+            if isinstance(mapped, mmap.mmap):
+                mapped.close()
+
+
+class BookColumn:
+    """
+    索引单词本中单词列或词义列的只读视图，可以像列表一样按序号或切片访问。
+    """
+
+    def __init__(self, book: IndexedWordBook, column: int):
+        self.book = book
+        self.column = column
+
+    def __len__(self) -> int:
+        return len(self.book)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self.book.get_field(i, self.column) for i in range(*index.indices(len(self.book)))]
+        return self.book.get_field(index, self.column)
+
+    def __iter__(self):
+        for i in range(len(self.book)):
+            yield self.book.get_field(i, self.column)
+
+    def __bool__(self) -> bool:
+        return len(self.book) > 0
@@ -18,7 +18,8 @@ from file_io import read_words, write_words
 
 def console_learning(file_index: int, cycle_random_mode: bool=False) -> None:
     file_name = get_file_name_by_index(file_index)
-    words, meanings = read_words(file_name)
+    # 按需读取，只解码实际浏览到的条目
+    words, meanings = read_words(file_name, lazy=True)
     
     if len(words) != len(meanings):
         print("错误: 单词列表和词义列表长度不匹配!")
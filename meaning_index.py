@@ -0,0 +1,212 @@
+"""
+词义索引模块：从汉语词义反查英文单词的本地倒排索引。
+
+每个来源（单词本或翻译缓存）的每个条目经 utils.split_meanings 分割为若干词义，
+词义中的每个单字和相邻两字都作为索引项，索引项 -> 条目序号集合。
+查询时取查询词的所有索引项对应集合的交集，再确认词义确实包含查询词，
+因此查询耗时只与命中的条目数有关，与单词本的总条目数无关。
+
+索引只保存在内存中：单词本第一次被查询时整体建立，之后随写入增量更新，
+单词本在程序外被修改（修改时间或大小变化）时重新建立。
+翻译缓存的更新来自批量翻译的工作线程，所有读写索引的操作都持有 index_lock。
+"""
+
+import re
+from threading import RLock
+
+from config import config
+from translation_cache import read_cached_translations
+from utils import split_meanings
+
+# 翻译缓存作为来源时使用的名称
+CACHE_SOURCE = "翻译缓存"
+# 词义中不参与匹配的空白字符
+SPACE_RE = re.compile(r"\s+")
+# 词义内部的分隔符，按分隔符切开的片段与查询词完全相同时视为精确匹配
+SEGMENT_RE = re.compile(r"[；;，,、]")
+
+# 各来源的索引：来源名 -> {"stamp": (修改时间, 文件大小), "entries": [(单词, 词义, 分割后的词义)], "postings": 索引项 -> 条目序号集合}
+sources = {}
+# 保护 sources 的锁（可重入：update_source 持有锁时调用 index_entries）
+index_lock = RLock()
+
+
+def make_grams(text: str) -> set:
+    """
+    生成文本的索引项：单字和相邻两字。
+
+    Args:
+        text (str): 去除空白后的文本。
+
+    Returns:
+        set: 索引项集合。
+    """
+    grams = set(text)
+    grams.update(text[i:i + 2] for i in range(len(text) - 1))
+    return grams
+
+
+def make_query_grams(query: str) -> set:
+    """
+    生成查询词的索引项：两字及以上的查询只用相邻两字，减少需要求交集的集合数。
+
+    Args:
+        query (str): 去除空白后的查询词。
+
+    Returns:
+        set: 索引项集合。
+    """
+    if len(query) == 1:
+        return {query}
+    return {query[i:i + 2] for i in range(len(query) - 1)}
+
+
+def index_entries(source: str, words, meanings, stamp: tuple | None = None, append: bool = False,
+                  senses: list | None = None) -> None:
+    """
+    将条目加入来源的索引。
+
+    Args:
+        source (str): 来源名（单词本文件名或 CACHE_SOURCE）。
+        words: 单词列表。
+        meanings: 词义列表。
+        stamp (tuple | None): 来源文件当前的 (修改时间, 文件大小)，用于判断索引是否过期。
+        append (bool): 是否追加到已有索引，否则重建该来源的索引。
+        senses (list | None): 各条目已分割好的词义（如单词本投影中的结果），为 None 时用 split_meanings 分割。
+    """
+    # 分割词义不需要持有锁
+    if senses is None:
+        senses = [split_meanings(meaning) for meaning in meanings]
+    senses = [[sense for sense in (SPACE_RE.sub("", sense) for sense in entry_senses) if sense]
+              for entry_senses in senses]
+
+    with index_lock:
+        index = sources.get(source)
+        if index is None or not append:
+            index = {"stamp": None, "entries": [], "postings": {}}
+            sources[source] = index
+
+        entries = index["entries"]
+        postings = index["postings"]
+        for word, meaning, entry_senses in zip(words, meanings, senses):
+            entry_id = len(entries)
+            entries.append((word, meaning, entry_senses))
+            for sense in entry_senses:
+                for gram in make_grams(sense):
+                    postings.setdefault(gram, set()).add(entry_id)
+        index["stamp"] = stamp
+
+
+def update_source(source: str, words, meanings, stamp: tuple | None, append: bool = False) -> None:
+    """
+    单词本写入后增量更新索引。尚未建立索引的来源不做处理，等第一次查询时再整体建立。
+
+    Args:
+        source (str): 来源名。
+        words: 新写入的单词列表（append 为 False 时为全部单词）。
+        meanings: 对应的词义列表。
+        stamp (tuple | None): 写入后来源文件的 (修改时间, 文件大小)。
+        append (bool): 是否为追加写入。
+    """
+    with index_lock:
+        if source in sources:
+            index_entries(source, words, meanings, stamp, append)
+
+
+def index_translation_cache() -> None:
+    """
+    为翻译缓存建立索引（只在第一次调用时读取数据库，之后随缓存写入增量更新）。
+    """
+    with index_lock:
+        if CACHE_SOURCE in sources or not config["translation_cache_enabled"]:
+            return
+        words, meanings = read_cached_translations()
+        index_entries(CACHE_SOURCE, words, meanings)
+
+
+def drop_source(source: str) -> None:
+    """
+    删除来源的索引，下次查询时重新建立。
+
+    Args:
+        source (str): 来源名。
+    """
+    with index_lock:
+        sources.pop(source, None)
+
+
+def get_source_stamp(source: str) -> tuple | None:
+    """
+    获取来源索引建立时的 (修改时间, 文件大小)，来源尚未建立索引时返回 None。
+
+    Args:
+        source (str): 来源名。
+
+    Returns:
+        tuple | None: 来源文件的修改时间和大小。
+    """
+    with index_lock:
+        index = sources.get(source)
+        return index["stamp"] if index else None
+
+
+def rank_sense(sense: str, query: str) -> int:
+    """
+    计算词义与查询词的匹配程度，数值越小越匹配。
+
+    Returns:
+        int: 0 表示词义与查询词相同，1 表示词义中的某一片段与查询词相同，
+            2 表示词义以查询词开头，3 表示词义包含查询词，-1 表示不匹配。
+    """
+    if sense == query:
+        return 0
+    if query in SEGMENT_RE.split(sense):
+        return 1
+    if sense.startswith(query):
+        return 2
+    if query in sense:
+        return 3
+    return -1
+
+
+def search(query: str, limit: int = 20, exact: bool = False) -> list[dict]:
+    """
+    在所有已建立索引的来源中查找词义包含查询词的单词，同一单词只保留匹配程度最高的结果。
+
+    Args:
+        query (str): 汉语查询词。
+        limit (int): 最多返回的结果数，小于等于 0 时不限制。
+        exact (bool): 是否只返回词义（或其中某一片段）与查询词完全相同的结果。
+
+    Returns:
+        list[dict]: 按匹配程度排序的结果，每项包含 word、meaning、sense、source 和 rank。
+    """
+    query = SPACE_RE.sub("", query)
+    if not query:
+        return []
+    grams = make_query_grams(query)
+
+    best = {}
+    with index_lock:
+        for source, index in sources.items():
+            postings = index["postings"]
+            # 从最小的集合开始求交集
+            candidate_sets = sorted((postings.get(gram, set()) for gram in grams), key=len)
+            if not candidate_sets[0]:
+                continue
+            candidates = candidate_sets[0].intersection(*candidate_sets[1:])
+            for entry_id in candidates:
+                word, meaning, senses = index["entries"][entry_id]
+                ranked = [(rank_sense(sense, query), len(sense), sense) for sense in senses]
+                ranked = [item for item in ranked if item[0] >= 0]
+                if not ranked:
+                    continue
+                rank, length, sense = min(ranked)
+                if exact and rank > 1:
+                    continue
+                key = word.strip().lower()
+                if key not in best or (rank, length) < (best[key]["rank"], len(best[key]["sense"])):
+                    best[key] = {"word": word, "meaning": meaning, "sense": sense, "source": source, "rank": rank}
+
+    results = sorted(best.values(), key=lambda item: (item["rank"], len(item["sense"]), item["word"]))
+    return results[:limit] if limit > 0 else results
@@ -0,0 +1,200 @@
+"""
+近邻索引模块：为困难模式的单词测试查找与正确答案最相近的干扰项。
+
+1. 拼写近邻（释义到单词测试）：单词的相邻两字母（含词首、词尾标记）按单词长度分别组成倒排索引，
+   只在长度相差不超过最大编辑距离的单词中、按较少见的片段选出候选单词，再按编辑距离由近到远排序，
+   每道题的开销与单词本大小无关
+2. 词义近邻（单词到释义测试）：过滤后词义中的相邻两字组成倒排索引，按共同的两字片段数排序
+
+索引按单词本缓存在内存中，单词本修改（修改时间或大小变化）后重新建立；
+每个条目的近邻只在第一次出题时查找，之后直接使用。
+"""
+
+import re
+from collections import Counter
+from itertools import chain
+
+# 词义中不参与匹配的空白和标点
+MEANING_NOISE_RE = re.compile(r"[\s；;，,、.()（）\[\]【】]+")
+# 查找拼写近邻时的最大编辑距离
+MAX_SPELLING_DISTANCE = 4
+# 查找拼写近邻时，按共同片段数选出、再计算编辑距离的候选单词数
+SPELLING_CANDIDATES = 40
+# 同一长度的单词中出现次数超过该值的拼写片段（如 "e$"、"er"）区分度太低，不参与候选单词的计数
+SPELLING_GRAM_LIMIT = 200
+# 出现在超过该比例条目中的两字片段（如 "…的"）区分度太低，不参与词义近邻的计算
+COMMON_GRAM_RATIO = 0.05
+
+# 各单词本的近邻索引：文件名 -> NeighborIndex
+neighbor_indexes = {}
+
+
+def edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    计算两个字符串的编辑距离，超过 limit 时提前结束并返回 limit + 1。
+
+    Args:
+        a (str): 字符串。
+        b (str): 字符串。
+        limit (int): 关心的最大距离。
+
+    Returns:
+        int: 编辑距离，超过 limit 时为 limit + 1。
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    if len(a) < len(b):
+        a, b = b, a
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, start=1):
+        current = [i]
+        for j, char_b in enumerate(b, start=1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+def get_spelling_grams(word: str) -> set:
+    """
+    生成单词的拼写片段：加上词首、词尾标记后的相邻两字母。
+
+    Args:
+        word (str): 小写单词。
+
+    Returns:
+        set: 片段集合。
+    """
+    text = f"^{word}$"
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+class NeighborIndex:
+    """
+    一个单词本的近邻索引。
+    """
+
+    def __init__(self, words: list, projections: list, stamp: tuple | None = None):
+        """
+        Args:
+            words (list): 单词列表。
+            projections (list): 与单词一一对应的词义投影（见 book_projection）。
+            stamp (tuple | None): 单词本的 (修改时间, 文件大小)，用于判断索引是否过期。
+        """
+        self.stamp = stamp
+        self.words = [word.strip().lower() for word in words]
+        self.meanings = [projection[0] for projection in projections]
+        self.spelling_cache = {}
+        self.meaning_cache = {}
+
+        # (片段, 单词长度) -> 条目序号
+        self.spelling_postings = {}
+        for i, word in enumerate(self.words):
+            for gram in get_spelling_grams(word):
+                self.spelling_postings.setdefault((gram, len(word)), []).append(i)
+
+        self.meaning_grams = []
+        self.postings = {}
+        for i, meaning in enumerate(self.meanings):
+            text = MEANING_NOISE_RE.sub("", meaning)
+            grams = {text[j:j + 2] for j in range(len(text) - 1)}
+            self.meaning_grams.append(grams)
+            for gram in grams:
+                self.postings.setdefault(gram, []).append(i)
+        common_limit = max(50, int(len(self.meanings) * COMMON_GRAM_RATIO))
+        self.postings = {gram: ids for gram, ids in self.postings.items() if len(ids) <= common_limit}
+
+    def spelling_neighbors(self, index: int, count: int = 3) -> list[int]:
+        """
+        查找拼写最接近的条目：在长度相差不超过 MAX_SPELLING_DISTANCE 的单词中，
+        先取共同片段最多的若干候选单词，再按编辑距离排序。出现次数超过 SPELLING_GRAM_LIMIT 的片段不参与计数，
+        所有片段都过于常见时，从这些片段中各取少量单词作为候选。
+        编辑距离超过 MAX_SPELLING_DISTANCE 的不作为干扰项，与该单词拼写相同的条目也不作为干扰项。
+
+        Args:
+            index (int): 正确答案的条目序号。
+            count (int): 需要的干扰项个数。
+
+        Returns:
+            list[int]: 按编辑距离由近到远排列的条目序号，可能少于 count 个。
+        """
+        if index not in self.spelling_cache:
+            word = self.words[index]
+            rare = []
+            common = []
+            for gram in get_spelling_grams(word):
+                for length in range(len(word) - MAX_SPELLING_DISTANCE, len(word) + MAX_SPELLING_DISTANCE + 1):
+                    ids = self.spelling_postings.get((gram, length))
+                    if ids:
+                        (common if len(ids) > SPELLING_GRAM_LIMIT else rare).append(ids)
+            shared = Counter(chain.from_iterable(rare))
+            if len(shared) <= 1:
+                shared.update(chain.from_iterable(ids[:SPELLING_CANDIDATES] for ids in common))
+            # 共同片段最多的候选单词（相同时长度相近的在前），同一拼写只保留一个条目
+            ranked = sorted(shared.most_common(SPELLING_CANDIDATES * 2),
+                            key=lambda item: (-item[1], abs(len(self.words[item[0]]) - len(word))))
+            candidates = {}
+            for i, _ in ranked:
+                candidate = self.words[i]
+                if candidate != word and candidate not in candidates:
+                    candidates[candidate] = i
+            candidates = list(candidates.values())[:SPELLING_CANDIDATES]
+            found = []
+            # 已找到 count 个近邻后，只需计算不超过其中最远距离的候选单词
+            limit = MAX_SPELLING_DISTANCE
+            for i in candidates:
+                distance = edit_distance(word, self.words[i], limit)
+                if distance <= limit:
+                    found.append((distance, -shared[i], i))
+                    if len(found) >= count:
+                        found.sort()
+                        limit = found[count - 1][0]
+            found.sort()
+            self.spelling_cache[index] = [i for _, _, i in found[:count]]
+        return self.spelling_cache[index]
+
+    def meaning_neighbors(self, index: int, count: int = 3) -> list[int]:
+        """
+        查找词义最接近的条目：共同的两字片段越多越接近。词义完全相同的条目不作为干扰项。
+
+        Args:
+            index (int): 正确答案的条目序号。
+            count (int): 需要的干扰项个数。
+
+        Returns:
+            list[int]: 按接近程度排列的条目序号，可能少于 count 个。
+        """
+        if index not in self.meaning_cache:
+            scores = {}
+            for gram in self.meaning_grams[index]:
+                for i in self.postings.get(gram, ()):
+                    scores[i] = scores.get(i, 0) + 1
+            meaning = self.meanings[index]
+            ranked = sorted(
+                (-score, abs(len(self.meanings[i]) - len(meaning)), i)
+                for i, score in scores.items()
+                if i != index and self.meanings[i] != meaning
+            )
+            self.meaning_cache[index] = [i for _, _, i in ranked[:count]]
+        return self.meaning_cache[index]
+
+
+def get_neighbor_index(file_name: str, stamp: tuple | None, words: list, projections: list) -> NeighborIndex:
+    """
+    获取单词本的近邻索引，单词本未修改时直接使用缓存的索引。
+
+    Args:
+        file_name (str): 单词本文件名。
+        stamp (tuple | None): 单词本的 (修改时间, 文件大小)。
+        words (list): 单词列表。
+        projections (list): 词义投影列表。
+
+    Returns:
+        NeighborIndex: 近邻索引。
+    """
+    index = neighbor_indexes.get(file_name)
+    if index is None or stamp is None or index.stamp != stamp:
+        index = NeighborIndex(words, projections, stamp)
+        neighbor_indexes[file_name] = index
+    return index
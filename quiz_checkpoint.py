@@ -0,0 +1,113 @@
+"""
+测试进度模块：定期保存测试进度，中途退出后可以从退出的位置继续测试。
+
+单词本文件夹下的两个文件：
+    test_session.json：测试开始后第一次保存进度时写入，包含测试模式、出题顺序和测试用的
+        单词、词义、题目和选项文本，继续测试时直接使用，不需要重新读取和处理单词本
+    test_session.checkpoint：每答 config["checkpoint_interval"] 道题和退出时改写，
+        只包含下一道题的位置和已作答题目的结果
+两个文件都带有测试编号，只有编号一致时才能继续测试；测试正常结束后删除。
+"""
+
+import json
+from os import remove, replace
+from os.path import exists
+from time import time
+
+from quiz_engine import QuizEngine
+
+SESSION_VERSION = 1
+SNAPSHOT_PATH = "test_session.json"
+CHECKPOINT_PATH = "test_session.checkpoint"
+
+
+def new_session_id() -> str:
+    """
+    生成测试编号。
+    """
+    return f"{time():.6f}"
+
+
+def write_json(path: str, data: dict) -> None:
+    """
+    先写入临时文件再替换，避免写入中断留下不完整的文件。
+    """
+    with open(f"{path}.tmp", "w", encoding="utf-8") as file:
+        json.dump(data, file, ensure_ascii=False, separators=(",", ":"))
+    replace(f"{path}.tmp", path)
+
+
+def save_snapshot(session: str, engine: QuizEngine, book: str, wrong_index: int) -> None:
+    """
+    保存测试数据（只需在每次测试中保存一次）。
+
+    Args:
+        session (str): 测试编号。
+        engine (QuizEngine): 测试引擎。
+        book (str): 单词本名称。
+        wrong_index (int): 错题本索引。
+    """
+    snapshot = {"version": SESSION_VERSION, "session": session, "book": book, "wrong_index": wrong_index}
+    snapshot.update(engine.snapshot())
+    write_json(SNAPSHOT_PATH, snapshot)
+
+
+def save_checkpoint(session: str, engine: QuizEngine) -> None:
+    """
+    保存测试进度。
+
+    Args:
+        session (str): 测试编号。
+        engine (QuizEngine): 测试引擎。
+    """
+    write_json(CHECKPOINT_PATH, {
+        "session": session,
+        "position": engine.position,
+        "results": [[index, int(correct)] for index, correct in engine.results.items()],
+    })
+
+
+def load_session() -> tuple[str, QuizEngine, str, int] | None:
+    """
+    读取保存的测试并恢复测试引擎。
+
+    Returns:
+        tuple | None: (测试编号, 测试引擎, 单词本名称, 错题本索引)；没有可以继续的测试时返回 None。
+    """
+    if not exists(SNAPSHOT_PATH) or not exists(CHECKPOINT_PATH):
+        return None
+    try:
+        with open(SNAPSHOT_PATH, "r", encoding="utf-8") as file:
+            snapshot = json.load(file)
+        with open(CHECKPOINT_PATH, "r", encoding="utf-8") as file:
+            checkpoint = json.load(file)
+    except (OSError, ValueError) as e:
+        print(f"读取测试进度失败：{e}")
+        return None
+    if snapshot.get("version") != SESSION_VERSION or snapshot.get("session") != checkpoint.get("session"):
+        return None
+
+    engine = QuizEngine.from_snapshot(snapshot)
+    engine.restore(snapshot["order"], checkpoint["position"], checkpoint["results"])
+    return snapshot["session"], engine, snapshot["book"], snapshot["wrong_index"]
+
+
+def clear_session(session: str) -> None:
+    """
+    删除测试进度。只在保存的进度属于该测试时删除，中途开始并完成的其他测试不影响之前保存的进度。
+
+    Args:
+        session (str): 测试编号。
+    """
+    if not exists(CHECKPOINT_PATH):
+        return
+    try:
+        with open(CHECKPOINT_PATH, "r", encoding="utf-8") as file:
+            saved = json.load(file).get("session")
+    except (OSError, ValueError):
+        saved = None
+    if saved != session:
+        return
+    remove(CHECKPOINT_PATH)
+    if exists(SNAPSHOT_PATH):
+        remove(SNAPSHOT_PATH)
@@ -0,0 +1,287 @@
+"""
+测试引擎模块：不依赖输入输出的单词测试逻辑，负责出题、判分和记录错题。
+
+控制台测试（training.conduct_test）和模拟器（benchmarks/simulate_tests.py）都通过它进行测试：
+    engine = QuizEngine(words, meanings, test_mode)
+    while (question := engine.next_question()) is not None:
+        outcome = engine.answer(...)  # 或 engine.skip()
+"""
+
+import random
+from time import perf_counter
+
+from book_projection import project_meaning
+from neighbor_index import NeighborIndex
+from utils import format_pron
+
+# 每道题的尝试次数
+MAX_ATTEMPTS = 3
+
+
+def sample_distractors(length: int, answer_index: int, count: int = 3, chosen: list[int] = ()) -> list[int]:
+    """
+    从 0 到 length-1 中随机选取 count 个不同的干扰项序号（不包括正确答案），
+    选中重复或正确答案时重新抽取。length 远大于 count 时每题的期望耗时为常数。
+
+    Args:
+        length (int): 题库条目数（不小于 count+1）。
+        answer_index (int): 正确答案的序号。
+        count (int): 干扰项个数。
+        chosen (list[int]): 已经选定的干扰项（如困难模式的近邻），不足 count 个时随机补足。
+
+    Returns:
+        list[int]: 干扰项序号列表。
+    """
+    distractors = [index for index in chosen if index < length and index != answer_index][:count]
+    while len(distractors) < count:
+        index = random.randrange(length)
+        if index != answer_index and index not in distractors:
+            distractors.append(index)
+    return distractors
+
+
+class QuizEngine:
+    """
+    一次单词测试，支持三种测试模式：
+    1. 单词到释义（选择题）
+    2. 释义到单词（选择题）
+    3. 释义到默写（填空题）
+    """
+
+    def __init__(self, words: list[str], meanings: list[str], test_mode: int,
+                 projections: list | None = None, hard: bool = False,
+                 neighbor_index: NeighborIndex | None = None):
+        """
+        Args:
+            words (list[str]): 单词列表。
+            meanings (list[str]): 释义列表。
+            test_mode (int): 测试模式(1/2/3)。
+            projections (list | None): 与单词一一对应的词义投影（见 book_projection），为 None 时现场生成。
+            hard (bool): 是否为困难模式：选择题的干扰项取与正确答案最相近的条目（模式1按词义，模式2按拼写）。
+            neighbor_index (NeighborIndex | None): 困难模式使用的近邻索引，为 None 时现场建立。
+        """
+        self.words = list(words)
+        self.original_meanings = list(meanings)
+        if projections is None:
+            projections = [project_meaning(meaning) for meaning in meanings]
+        else:
+            projections = list(projections)
+        if hard and neighbor_index is None:
+            neighbor_index = NeighborIndex(words, projections)
+        self.test_mode = test_mode
+        self.hard = hard
+        self.neighbor_index = neighbor_index
+        self.is_choice_question = (test_mode != 3)  # 模式3为填空题
+
+        # 确保测试词库至少有5个条目（不足时填充占位符）
+        self.length = len(self.words)
+        while self.length < 5:
+            self.words.append(f"####{self.length}")
+            self.original_meanings.append(f"#@#@{self.length}\n#@#@{self.length}\n#@#@{self.length}")
+            projections.append(project_meaning(self.original_meanings[-1]))
+            self.length += 1
+
+        # 模式1在单词下方显示音标
+        shown_words = self.words
+        if test_mode == 1:
+            shown_words = [
+                word if word.startswith('#') else f"{word}\n{format_pron(projection[2], projection[3])}"
+                for word, projection in zip(self.words, projections)
+            ]
+        # 使用投影中已过滤的词义
+        shown_meanings = [projection[0] for projection in projections]
+
+        # 根据测试模式确定问题和答案的对应关系
+        self.questions, self.answers = shown_words, shown_meanings
+        if test_mode in (2, 3):
+            self.questions, self.answers = self.answers, self.words  # 交换问题和答案
+
+        # 随机打乱题目顺序，从打乱后的末尾开始出题
+        self.order = list(range(self.length))
+        random.shuffle(self.order)
+        self.order.reverse()
+        self.position = 0  # 当前题目在 order 中的位置
+
+        self.results = {}  # 各题的作答结果
+        self.wrong_words = []  # 记录错误单词
+        self.wrong_meanings = []  # 记录错误释义
+        self.current = None  # 当前未完成的题目
+
+    def snapshot(self) -> dict:
+        """
+        导出测试数据（题目和选项文本、出题顺序等），用于保存测试进度（见 quiz_checkpoint）。
+
+        Returns:
+            dict: 可以用 from_snapshot 恢复的字典。
+        """
+        return {
+            "test_mode": self.test_mode,
+            "hard": self.hard,
+            "words": self.words,
+            "meanings": self.original_meanings,
+            "questions": self.questions,
+            # 模式2、3的答案就是单词，不重复保存
+            "answers": None if self.answers is self.words else self.answers,
+            "order": self.order,
+        }
+
+    @classmethod
+    def from_snapshot(cls, snapshot: dict) -> "QuizEngine":
+        """
+        由 snapshot 导出的数据恢复测试引擎，直接使用保存的题目文本，不重新处理词义。
+        进度为刚开始测试时的状态，需要再用 restore 恢复。
+
+        Args:
+            snapshot (dict): snapshot 的返回值。
+
+        Returns:
+            QuizEngine: 测试引擎。
+        """
+        engine = cls.__new__(cls)
+        engine.words = snapshot["words"]
+        engine.original_meanings = snapshot["meanings"]
+        engine.test_mode = snapshot["test_mode"]
+        engine.hard = snapshot["hard"]
+        engine.is_choice_question = (engine.test_mode != 3)
+        engine.length = len(engine.words)
+        engine.questions = snapshot["questions"]
+        engine.answers = snapshot["answers"] if snapshot["answers"] is not None else engine.words
+        engine.neighbor_index = None
+        if engine.hard:
+            # 近邻索引只用到过滤后的词义
+            filtered = engine.answers if engine.test_mode == 1 else engine.questions
+            engine.neighbor_index = NeighborIndex(engine.words, [[meaning] for meaning in filtered])
+        engine.restore(snapshot["order"], 0, [])
+        return engine
+
+    def restore(self, order: list[int], position: int, results: list) -> None:
+        """
+        恢复保存的测试进度（见 quiz_checkpoint），错题按作答顺序由结果重建。
+
+        Args:
+            order (list[int]): 出题顺序。
+            position (int): 下一道题在出题顺序中的位置。
+            results (list): 按作答顺序排列的 (条目序号, 是否答对)。
+        """
+        self.order = list(order)
+        self.position = position
+        self.current = None
+        self.results = {}
+        self.wrong_words = []
+        self.wrong_meanings = []
+        for index, correct in results:
+            self.results[index] = bool(correct)
+            if not correct:
+                self.wrong_words.append(self.words[index])
+                self.wrong_meanings.append(self.original_meanings[index])
+
+    def next_question(self) -> dict | None:
+        """
+        获取当前题目，上一题未完成时返回同一题。
+
+        Returns:
+            dict | None: 包含 index（条目序号）、number（第几题）、total（总题数）、text（题目）、
+                options（选择题的选项文本，填空题为 None）和 answer（正确选项的位置或正确单词）的字典；
+                全部题目完成时返回 None。
+        """
+        if self.current is not None:
+            return self.current
+        # 跳过占位符题目（格式为####开头）
+        while self.position < self.length and self.words[self.order[self.position]].startswith('#'):
+            self.position += 1
+        if self.position >= self.length:
+            return None
+
+        current_index = self.order[self.position]
+        options = None
+        if self.is_choice_question:
+            # 生成包含正确答案的选项列表
+            if self.hard and self.test_mode == 1:
+                neighbors = self.neighbor_index.meaning_neighbors(current_index)  # 词义相近的干扰项
+            elif self.hard:
+                neighbors = self.neighbor_index.spelling_neighbors(current_index)  # 拼写相近的干扰项
+            else:
+                neighbors = ()
+            option_indices = sample_distractors(self.length, current_index, chosen=neighbors)
+            option_indices.append(current_index)  # 加入正确答案
+            random.shuffle(option_indices)  # 打乱选项顺序
+            options = [self.answers[option_index] for option_index in option_indices]
+            correct_answer = option_indices.index(current_index)  # 记录正确答案位置
+        else:
+            # 填空题直接记录正确答案
+            correct_answer = self.answers[current_index]
+
+        self.current = {
+            "index": current_index,
+            "number": self.position + 1,
+            "total": self.length,
+            "text": self.questions[current_index],
+            "options": options,
+            "answer": correct_answer,
+        }
+        self.remain_chance = MAX_ATTEMPTS
+        self.attempts = 0
+        self.question_begin = perf_counter()
+        return self.current
+
+    def answer(self, response: int | str) -> dict:
+        """
+        对当前题目作答。
+
+        Args:
+            response (int | str): 选择题为选项位置（从0开始），填空题为输入的单词。
+
+        Returns:
+            dict: 作答结果，见 finish_question；答错且还有尝试次数时 done 为 False。
+        """
+        question = self.next_question()
+        if question is None:
+            raise ValueError("测试已经结束")
+        self.attempts += 1
+        if response == question["answer"]:
+            return self.finish_question(True)
+        self.remain_chance -= 1
+        if self.remain_chance > 0:
+            return {"correct": False, "remaining": self.remain_chance, "done": False}
+        return self.finish_question(False)
+
+    def skip(self) -> dict:
+        """
+        跳过当前题目，按答错记录。
+
+        Returns:
+            dict: 作答结果，见 finish_question。
+        """
+        if self.next_question() is None:
+            raise ValueError("测试已经结束")
+        self.remain_chance = 0
+        return self.finish_question(False)
+
+    def finish_question(self, correct: bool) -> dict:
+        """
+        结束当前题目，记录结果和错题。
+
+        Args:
+            correct (bool): 是否答对。
+
+        Returns:
+            dict: 包含 correct、remaining（剩余尝试次数）、done（题目是否完成）、word（不含音标的单词）、
+                attempts（作答次数）和 latency（从出题到完成的用时，秒）的字典。
+        """
+        current_index = self.current["index"]
+        word = self.words[current_index]
+        self.results[current_index] = correct
+        if not correct:
+            self.wrong_words.append(word)
+            self.wrong_meanings.append(self.original_meanings[current_index])
+        outcome = {
+            "correct": correct,
+            "remaining": self.remain_chance,
+            "done": True,
+            "word": word,
+            "attempts": self.attempts,
+            "latency": perf_counter() - self.question_begin,
+        }
+        self.current = None
+        self.position += 1
+        return outcome
@@ -0,0 +1,255 @@
+"""
+复习计划模块：按艾宾浩斯遗忘曲线安排单词的复习时间。
+
+每个被跟踪的单词保存一条定长记录（下次复习时间、上次复习时间、所处阶段、答错次数；
+阶段为连续答对的次数，第 k 阶段答对后按 REVIEW_INTERVALS[k] 安排下次复习），
+记录与单词一一对应地保存在艾宾浩斯单词本旁的两个文件中：
+    <name>$sched.keys：每行一个规范化后的单词，顺序与记录一致
+    <name>$sched.bin：文件头 + 每个单词 16 字节的记录
+新增单词只在两个文件末尾追加，复习后只原地改写被复习单词的记录，不重写整个文件；
+只有移除单词（单词已从单词本中删除）时才重写两个文件。
+
+载入后所有记录按下次复习时间放入最小堆，取出到期单词为 O(log n)；
+记录更新后旧的堆元素不删除，取出时与记录比对，已过时的直接丢弃。
+"""
+
+import heapq
+import struct
+from array import array
+from os.path import exists
+from time import time
+
+from word_format import normalize_word
+
+SCHEDULE_MAGIC = b"EBS1"
+# 单条记录：下次复习时间、上次复习时间、阶段、答错次数
+RECORD = struct.Struct("<dIHH")
+# 各阶段答对后到下次复习的间隔（秒）：20分钟、1小时、9小时、1天、2天、6天、31天，
+# 新单词第一次答对后按第一个间隔复习，之后的阶段超过最后一个间隔时一直使用最后一个间隔
+REVIEW_INTERVALS = [20 * 60, 3600, 9 * 3600, 24 * 3600, 2 * 24 * 3600, 6 * 24 * 3600, 31 * 24 * 3600]
+
+# 已载入的复习计划：艾宾浩斯单词本文件名 -> ReviewScheduler
+schedulers = {}
+
+
+class ReviewScheduler:
+    """
+    一个艾宾浩斯单词本的复习计划。
+    """
+
+    def __init__(self, file_name: str):
+        """
+        Args:
+            file_name (str): 艾宾浩斯单词本文件名。
+        """
+        self.keys_path = f"{file_name}$sched.keys"
+        self.records_path = f"{file_name}$sched.bin"
+        self.keys = []
+        self.positions = {}
+        self.due = array("d")
+        self.last_review = array("I")
+        self.stage = array("H")
+        self.misses = array("H")
+        self.load()
+
+    def load(self) -> None:
+        """
+        读取单词和记录，两个文件的条目数不一致时（如写入中断）以较少的为准。
+        """
+        if exists(self.keys_path):
+            with open(self.keys_path, "r", encoding="utf-8") as file:
+                self.keys = file.read().split("\n")[:-1]
+        records = b""
+        if exists(self.records_path):
+            with open(self.records_path, "rb") as file:
+                if file.read(len(SCHEDULE_MAGIC)) == SCHEDULE_MAGIC:
+                    records = file.read()
+        count = min(len(self.keys), len(records) // RECORD.size)
+        if count != len(self.keys) or count * RECORD.size != len(records):
+            self.keys = self.keys[:count]
+            self.rewrite(records[:count * RECORD.size])
+
+        for due, last_review, stage, misses in RECORD.iter_unpack(records[:count * RECORD.size]):
+            self.due.append(due)
+            self.last_review.append(last_review)
+            self.stage.append(stage)
+            self.misses.append(misses)
+        self.positions = {key: i for i, key in enumerate(self.keys)}
+        self.heap = [(due, i) for i, due in enumerate(self.due)]
+        heapq.heapify(self.heap)
+
+    def rewrite(self, records: bytes) -> None:
+        """
+        按当前的单词列表重写两个文件，只在载入时发现文件不一致或移除单词时调用。
+        """
+        with open(self.keys_path, "w", encoding="utf-8") as file:
+            file.write("".join(f"{key}\n" for key in self.keys))
+        with open(self.records_path, "wb") as file:
+            file.write(SCHEDULE_MAGIC + records)
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, word: str) -> bool:
+        return normalize_word(word) in self.positions
+
+    def add_words(self, words: list, now: float | None = None) -> list:
+        """
+        开始跟踪新单词，新单词立即到期。已跟踪的单词不会重复添加。
+
+        Args:
+            words (list): 单词列表。
+            now (float | None): 当前时间，默认为 time()。
+
+        Returns:
+            list: 实际新增的单词。
+        """
+        now = time() if now is None else now
+        added = []
+        new_keys = []
+        records = []
+        for word in words:
+            key = normalize_word(word)
+            if not key or key in self.positions:
+                continue
+            i = len(self.keys)
+            self.keys.append(key)
+            self.positions[key] = i
+            self.due.append(now)
+            self.last_review.append(0)
+            self.stage.append(0)
+            self.misses.append(0)
+            heapq.heappush(self.heap, (now, i))
+            new_keys.append(key)
+            records.append(RECORD.pack(now, 0, 0, 0))
+            added.append(word)
+        if not new_keys:
+            return added
+
+        # 先追加单词再追加记录，中断时载入会丢弃多出的单词
+        with open(self.keys_path, "a", encoding="utf-8") as file:
+            file.write("".join(f"{key}\n" for key in new_keys))
+        if not exists(self.records_path):
+            with open(self.records_path, "wb") as file:
+                file.write(SCHEDULE_MAGIC)
+        with open(self.records_path, "ab") as file:
+            file.write(b"".join(records))
+        return added
+
+    def remove(self, keys: list) -> None:
+        """
+        停止跟踪单词（如 pop_due 取出的单词已从单词本中删除），重写两个文件。
+
+        Args:
+            keys (list): 规范化后的单词。
+        """
+        removed = {self.positions[key] for key in keys if key in self.positions}
+        if not removed:
+            return
+        kept = [i for i in range(len(self.keys)) if i not in removed]
+        records = b"".join(RECORD.pack(self.due[i], self.last_review[i], self.stage[i], self.misses[i]) for i in kept)
+
+        # 堆只保留现有的有效元素并换成新序号，已被 pop_due 取出、尚未作答的单词不会重新入堆
+        new_positions = {old: new for new, old in enumerate(kept)}
+        self.heap = [(due, new_positions[i]) for due, i in self.heap if i in new_positions and due == self.due[i]]
+        heapq.heapify(self.heap)
+        self.keys = [self.keys[i] for i in kept]
+        self.due = array("d", (self.due[i] for i in kept))
+        self.last_review = array("I", (self.last_review[i] for i in kept))
+        self.stage = array("H", (self.stage[i] for i in kept))
+        self.misses = array("H", (self.misses[i] for i in kept))
+        self.positions = {key: i for i, key in enumerate(self.keys)}
+        self.rewrite(records)
+
+    def pop_due(self, limit: int = 0, now: float | None = None) -> list:
+        """
+        取出已到期的单词，按到期时间先后排列。取出的单词需要用 record_answers 记录结果，
+        未作答的用 postpone 放回，不再复习的用 remove 移除。
+
+        Args:
+            limit (int): 最多取出的单词数，小于等于 0 时不限制。
+            now (float | None): 当前时间，默认为 time()。
+
+        Returns:
+            list: 到期单词（规范化后的形式）。
+        """
+        now = time() if now is None else now
+        due_keys = []
+        while self.heap and self.heap[0][0] <= now and (limit <= 0 or len(due_keys) < limit):
+            due, i = heapq.heappop(self.heap)
+            # 记录已更新过的旧堆元素直接丢弃
+            if due != self.due[i]:
+                continue
+            due_keys.append(self.keys[i])
+        return due_keys
+
+    def postpone(self, keys: list) -> None:
+        """
+        把取出但未作答的单词放回，到期时间不变。
+
+        Args:
+            keys (list): pop_due 返回的单词。
+        """
+        for key in keys:
+            i = self.positions[key]
+            heapq.heappush(self.heap, (self.due[i], i))
+
+    def next_due_time(self) -> float | None:
+        """
+        获取最早的到期时间，没有跟踪的单词时返回 None。
+        """
+        while self.heap and self.heap[0][0] != self.due[self.heap[0][1]]:
+            heapq.heappop(self.heap)
+        return self.heap[0][0] if self.heap else None
+
+    def record_answers(self, results: dict, now: float | None = None) -> None:
+        """
+        根据答题结果更新复习计划：答对时按当前阶段的间隔安排下次复习并进入下一阶段，
+        答错时回到第一阶段、按第一个间隔安排下次复习并记一次答错。
+        只原地改写被复习单词的记录。
+
+        Args:
+            results (dict): 单词 -> 是否答对。
+            now (float | None): 当前时间，默认为 time()。
+        """
+        now = time() if now is None else now
+        updated = []
+        for word, correct in results.items():
+            i = self.positions.get(normalize_word(word))
+            if i is None:
+                continue
+            if correct:
+                interval = REVIEW_INTERVALS[min(self.stage[i], len(REVIEW_INTERVALS) - 1)]
+                self.stage[i] = min(self.stage[i] + 1, len(REVIEW_INTERVALS))
+            else:
+                interval = REVIEW_INTERVALS[0]
+                self.stage[i] = 0
+                self.misses[i] = min(self.misses[i] + 1, 0xFFFF)
+            self.due[i] = now + interval
+            self.last_review[i] = int(now)
+            heapq.heappush(self.heap, (self.due[i], i))
+            updated.append(i)
+        if not updated:
+            return
+
+        with open(self.records_path, "r+b") as file:
+            for i in sorted(updated):
+                file.seek(len(SCHEDULE_MAGIC) + i * RECORD.size)
+                file.write(RECORD.pack(self.due[i], self.last_review[i], self.stage[i], self.misses[i]))
+
+
+def get_scheduler(file_name: str) -> ReviewScheduler:
+    """
+    获取艾宾浩斯单词本的复习计划，第一次调用时从文件载入。
+
+    Args:
+        file_name (str): 艾宾浩斯单词本文件名。
+
+    Returns:
+        ReviewScheduler: 复习计划。
+    """
+    scheduler = schedulers.get(file_name)
+    if scheduler is None:
+        scheduler = ReviewScheduler(file_name)
+        schedulers[file_name] = scheduler
+    return scheduler
@@ -3,10 +3,16 @@
 模块包含核心测试逻辑、输入校验及不同测试模式的入口函数。
 """
 
-import random
-from collections import deque
-
-from file_io import read_words, write_words, save_old_file
+import time
+
+from file_io import read_words, read_projection, write_words, append_words, save_old_file, get_file_stamp
+from neighbor_index import NeighborIndex, get_neighbor_index
+from review_scheduler import get_scheduler
+from answer_log import log_answer
+from wrong_book import merge_wrong_words, remove_mastered_words
+from quiz_engine import QuizEngine
+from quiz_checkpoint import new_session_id, save_snapshot, save_checkpoint, load_session, clear_session
+from word_format import normalize_word
 from utils import *
 
 def check_if_right_num(input_str: str) -> int | None:
@@ -30,106 +36,94 @@ def check_if_right_num(input_str: str) -> int | None:
         return None
 
 
-def conduct_test(words: list[str], meanings: list[str], test_mode: int) -> None:
+def conduct_test(words: list[str], meanings: list[str], test_mode: int,
+                 projections: list | None = None, hard: bool = False,
+                 neighbor_index: NeighborIndex | None = None, book: str = "",
+                 checkpoint: bool = True) -> dict[int, bool]:
     """
-    测试执行核心逻辑，支持三种测试模式：
+    在控制台上进行测试：出题和判分由 QuizEngine 完成，这里负责显示题目、读取输入、
+    记录答题情况、保存测试进度和写入错题本。支持三种测试模式：
     1. 单词到释义（选择题）
     2. 释义到单词（选择题）
     3. 释义到默写（填空题）
 
-    :param words: 单词列表（包含占位符）
-    :param meanings: 释义列表（包含占位符）
+    :param words: 单词列表
+    :param meanings: 释义列表
     :param test_mode: 测试模式标识(1/2/3)
+    :param projections: 与单词一一对应的词义投影（见 book_projection），为 None 时现场生成
+    :param hard: 是否为困难模式：选择题的干扰项取与正确答案最相近的条目
+        （模式1按词义，模式2按拼写），模式1的错题写入词义（难）错题本
+    :param neighbor_index: 困难模式使用的近邻索引，为 None 时现场建立
+    :param book: 题目所在的单词本名称，每道题的作答情况都会记入答题记录（见 answer_log）
+    :param checkpoint: 是否定期保存测试进度，以便中途退出后用 resume_test 继续（见 quiz_checkpoint）
+    :return: 已作答题目的结果（题目序号 -> 是否答对），中途退出时只包含退出前的题目
     """
+    engine = QuizEngine(words, meanings, test_mode, projections, hard, neighbor_index)
+    # 错题本索引：困难模式的词义选择错题写入 999 号错题本
+    wrong_index = 999 if hard and test_mode == 1 else test_mode
+    session = new_session_id() if checkpoint else None
+    return run_test(engine, book, wrong_index, session)
 
-    # 确保测试词库至少有5个条目（不足时填充占位符）
-    length = len(words)
-    while length < 5:
-        words.append(f"####{length}")
-        meanings.append(f"#@#@{length}\n#@#@{length}\n#@#@{length}")
-        length += 1
-
-    original_meanings = meanings.copy()
-
-    if test_mode == 1:
-        for changing_idx in range(length):
-            if words[changing_idx].startswith('#'):
-                continue
-            words[changing_idx] += '\n' + print_pron(meanings[changing_idx].split('\n')[0])
-
-
-    meanings = [filter_meanings(meaning) for meaning in meanings]
-
-    # 根据测试模式确定问题和答案的对应关系
-    questions = words
-    answers = meanings
 
-    # 创建双重随机队列实现题目轮询机制
-    shuffled_indices = list(range(length))
-    random.shuffle(shuffled_indices)
-    shuffled_indices = deque(shuffled_indices)
-
-    if test_mode in (2, 3):
-        questions, answers = answers, words  # 交换问题和答案
-
-    wrong_words = []  # 记录错误单词
-    wrong_meanings = []  # 记录错误释义
-    is_choice_question = (test_mode != 3)  # 模式3为填空题
-
-    # 遍历所有题目进行测试
-    for num_tested_words in range(length):
-        # 环形队列操作保证题目循环
-        current_index = shuffled_indices[-1]
-        shuffled_indices.pop()
-        shuffled_indices.appendleft(current_index)
-
-        # 跳过占位符题目（格式为####开头）
-        if questions[current_index].startswith('#'):
-            continue
+def run_test(engine: QuizEngine, book: str, wrong_index: int, session: str | None,
+             snapshot_saved: bool = False) -> dict[int, bool]:
+    """
+    在控制台上进行（或继续）一次测试，见 conduct_test
+
+    :param engine: 测试引擎
+    :param book: 单词本名称
+    :param wrong_index: 错题本索引
+    :param session: 测试编号，为 None 时不保存测试进度
+    :param snapshot_saved: 测试数据是否已经保存过（继续测试时为 True）
+    :return: 已作答题目的结果（题目序号 -> 是否答对）
+    """
+    test_mode = engine.test_mode
+    prompt = "请输入选项数字：" if engine.is_choice_question else "请输入单词："
+    interval = config["checkpoint_interval"] if session is not None else 0
+
+    def save_progress():
+        # 测试数据只在第一次保存进度时写入，之后只改写进度
+        nonlocal snapshot_saved
+        if not snapshot_saved:
+            save_snapshot(session, engine, book, wrong_index)
+            snapshot_saved = True
+        save_checkpoint(session, engine)
+
+    while True:
+        question = engine.next_question()
+        if question is None:
+            break
 
         # 展示进度
-        print(f"\n\n\n{num_tested_words+1}/{length}")
+        print(f"\n\n\n{question['number']}/{question['total']}")
         # 展示当前问题
-        print_with_single_line_length(f'\n{questions[current_index]}\n')
-
-        # 处理选择题模式
-        if is_choice_question:
-            # 生成包含正确答案的选项列表
-            shuffled_indices.popleft()  # 临时移除当前索引
-            options = random.sample(shuffled_indices, 3)  # 随机选取3个干扰项
-            shuffled_indices.appendleft(current_index)  # 恢复当前索引
-
-            options.append(current_index)  # 加入正确答案
-            random.shuffle(options)  # 打乱选项顺序
-            correct_answer = options.index(current_index)  # 记录正确答案位置
-
-            # 显示所有选项
-            for i, option_index in enumerate(options):
-                print_with_single_line_length(f"{i+1}:\n{answers[option_index]}\n")
-        else:
-            # 填空题模式直接记录正确答案
-            correct_answer = answers[current_index]
+        print_with_single_line_length(f'\n{question["text"]}\n')
+        # 显示所有选项
+        if engine.is_choice_question:
+            for i, option in enumerate(question["options"]):
+                print_with_single_line_length(f"{i+1}:\n{option}\n")
 
         # 用户答题处理（最多3次尝试）
-        remain_chance = 3
-        while remain_chance > 0:
-            prompt = "请输入选项数字：" if is_choice_question else "请输入单词："
+        while True:
             user_input = scan_and_write_to_log(prompt)
 
             if user_input == '0':
                 print("已跳过")
-                remain_chance = 0
+                outcome = engine.skip()
                 break
             if user_input == 'quit()':
                 print("已退出")
+                if interval > 0:
+                    save_progress()
+                    print("已保存测试进度，可使用resume_test继续测试")
                 write_words(
-                    get_file_name_by_index(test_mode)+"__quited",
-                    wrong_words, wrong_meanings,
+                    get_file_name_by_index(wrong_index)+"__quited",
+                    engine.wrong_words, engine.wrong_meanings,
                     False)
-                return None
+                return engine.results
 
             # 选择题模式需要校验输入格式
-            if is_choice_question:
+            if engine.is_choice_question:
                 processed_input = check_if_right_num(user_input)
                 if processed_input is None:
                     continue  # 输入无效时重新提示
@@ -138,29 +132,54 @@ def conduct_test(words: list[str], meanings: list[str], test_mode: int) -> None:
                 processed_input = user_input.strip()
 
             # 答案校验
-            if processed_input == correct_answer:
+            outcome = engine.answer(processed_input)
+            if outcome["correct"]:
                 print("√答案正确！")
-                break
             else:
-                remain_chance -= 1
-                print(f"×答案错误，剩余尝试次数：{remain_chance}")
+                print(f"×答案错误，剩余尝试次数：{outcome['remaining']}")
+            if outcome["done"]:
+                break
 
-        # 记录错误答案
-        if remain_chance == 0:
+        # 记录作答情况
+        log_answer(book, outcome["word"], test_mode, outcome["attempts"], outcome["correct"], outcome["latency"])
+        if not outcome["correct"]:
             print("已加入错题本")
-            current_word = words[current_index]
-            if test_mode == 1:
-                current_word = current_word.split('\n')[0]
-            wrong_words.append(current_word)
-            wrong_meanings.append(original_meanings[current_index])
+        if interval > 0 and len(engine.results) % interval == 0:
+            save_progress()
+
+    # 将错误记录写入对应文件：合并模式下增量合并，否则覆盖
+    if config["merge_wrong_books"]:
+        wrong_file = get_file_name_by_index(wrong_index)
+        # 测试的就是错题本本身时，答对的单词从错题本中移除
+        if book == wrong_file:
+            mastered = [engine.words[i] for i, correct in engine.results.items() if correct]
+            removed = remove_mastered_words(wrong_file, mastered)
+            if removed:
+                print(f"已从错题本中移除{removed}个答对的单词")
+        merge_wrong_words(wrong_file, engine.wrong_words, engine.wrong_meanings)
+    else:
+        write_words(get_file_name_by_index(wrong_index),
+                    engine.wrong_words,
+                    engine.wrong_meanings,
+                    False)
+    if session is not None:
+        clear_session(session)
+    return engine.results
 
-    # 将错误记录写入对应文件
-    write_words(get_file_name_by_index(test_mode),
-                wrong_words,
-                wrong_meanings,
-                False)
 
-def test_words(file_index: int, test_mode: int, backup_old_wrong: bool) -> None:
+def resume_test() -> None:
+    """
+    继续上次中途退出的测试，直接使用保存的测试数据，不重新读取单词本
+    """
+    saved = load_session()
+    if saved is None:
+        print("没有可以继续的测试！")
+        return None
+    session, engine, book, wrong_index = saved
+    print(f"\n=== 继续测试，已完成{len(engine.results)}题 ===")
+    run_test(engine, book, wrong_index, session, True)
+
+def test_words(file_index: int, test_mode: int, backup_old_wrong: bool, hard: bool = False) -> None:
     """
     测试执行入口函数，根据测试模式调用相应的测试函数
     :param file_index: 词库文件索引
@@ -169,17 +188,19 @@ def test_words(file_index: int, test_mode: int, backup_old_wrong: bool) -> None:
         2 - 错误记录词库
         3 - 默写测试词库
         4 - 临时单词本
+        5 - 艾宾浩斯单词本
     :param test_mode: 测试模式标识(1/2/3)
         1 - 单词到释义测试
         2 - 释义到单词测试
         3 - 释义到默写测试
     :param backup_old_wrong: 是否备份旧错误记录
+    :param hard: 是否为困难模式（仅模式1、2），见 conduct_test
     """
-    if file_index not in (0, test_mode, 4, 5):
-        print("文件索引错误，有效值为0、4或测试模式对应的单词本！")
+    if file_index not in (0, test_mode, 4, 5) and not (hard and test_mode == 1 and file_index == 999):
+        print("文件索引错误，有效值为0、4、5或测试模式对应的单词本！")
         return None
-    if test_mode not in (1, 2, 3):
-        print("测试模式错误，有效值为1、2或3！")
+    if test_mode not in ((1, 2) if hard else (1, 2, 3)):
+        print("测试模式错误，有效值为1、2或3（困难模式为1或2）！")
         return None
     output_megssage = {
         1: "单词到释义测试",
@@ -187,15 +208,97 @@ def test_words(file_index: int, test_mode: int, backup_old_wrong: bool) -> None:
         3: "释义到默写测试"
     }
 
-    print(f"\n=== {output_megssage[test_mode]}开始 ===")
+    print(f"\n=== {output_megssage[test_mode]}{'（困难模式）' if hard else ''}开始 ===")
     # 读取测试词库
     target_file = get_file_name_by_index(file_index)
-    words, meanings = read_words(target_file)
+    words, meanings, projections = read_projection(target_file)
     # 备份旧错误记录
     if backup_old_wrong:
         save_old_file(target_file)
+    # 困难模式使用按单词本缓存的近邻索引
+    neighbor_index = None
+    if hard:
+        neighbor_index = get_neighbor_index(target_file, get_file_stamp(target_file), words, projections)
     # 进行测试
-    conduct_test(words, meanings, test_mode)
+    conduct_test(words, meanings, test_mode, projections, hard, neighbor_index, target_file)
+
+
+def test_words_hard(file_index: int, test_mode: int, backup_old_wrong: bool) -> None:
+    """
+    困难模式的单词测试：干扰项取与正确答案最相近的条目
+    :param file_index: 词库文件索引，模式1还可以使用999（词义（难）错题本）
+    :param test_mode: 测试模式标识(1/2)
+        1 - 单词到释义测试（干扰项词义相近）
+        2 - 释义到单词测试（干扰项拼写相近）
+    :param backup_old_wrong: 是否备份旧错误记录
+    """
+    test_words(file_index, test_mode, backup_old_wrong, hard=True)
+
+
+def schedule_words(file_index: int) -> None:
+    """
+    把单词本中的单词加入艾宾浩斯复习计划，新加入的单词同时追加到艾宾浩斯单词本，并立即到期
+    :param file_index: 词库文件索引
+    """
+    words, meanings = read_words(get_file_name_by_index(file_index))
+    ebbinghaus_file = get_file_name_by_index(5)
+    scheduler = get_scheduler(ebbinghaus_file)
+
+    added = scheduler.add_words(words)
+    if file_index != 5:
+        # 同一单词只追加第一次出现的条目
+        first_meanings = {}
+        for word, meaning in zip(words, meanings):
+            first_meanings.setdefault(word, meaning)
+        append_words(ebbinghaus_file, added, [first_meanings[word] for word in added])
+    print(f"新加入复习计划{len(added)}个单词，共跟踪{len(scheduler)}个单词。")
+
+
+def review(test_mode: int, limit: int) -> None:
+    """
+    复习艾宾浩斯单词本中已到期的单词，并根据答题结果安排下次复习时间
+    :param test_mode: 测试模式标识(1/2/3)，见 test_words
+    :param limit: 本次最多复习的单词数，小于等于0时复习全部到期单词
+    """
+    if test_mode not in (1, 2, 3):
+        print("测试模式错误，有效值为1、2或3！")
+        return None
+    ebbinghaus_file = get_file_name_by_index(5)
+    scheduler = get_scheduler(ebbinghaus_file)
+    due_keys = scheduler.pop_due(limit)
+    if not due_keys:
+        next_due = scheduler.next_due_time()
+        if next_due is None:
+            print("复习计划为空，请先用schedule_words加入单词！")
+        else:
+            print(f"当前没有到期的单词，下次复习时间：{time.strftime('%Y-%m-%d %H:%M', time.localtime(next_due))}")
+        return None
+
+    # 在艾宾浩斯单词本中找到到期单词的条目（已从单词本中删除的单词不再复习）
+    words, meanings, projections = read_projection(ebbinghaus_file)
+    positions = {}
+    for i, word in enumerate(words):
+        positions.setdefault(normalize_word(word), i)
+    selected = [(key, positions[key]) for key in due_keys if key in positions]
+    missing = [key for key in due_keys if key not in positions]
+    if missing:
+        scheduler.remove(missing)
+        print(f"{len(missing)}个到期单词已不在艾宾浩斯单词本中，已移出复习计划。")
+    if not selected:
+        return None
+
+    print(f"\n=== 艾宾浩斯复习开始，共{len(selected)}个到期单词 ===")
+    results = conduct_test([words[i] for _, i in selected],
+                           [meanings[i] for _, i in selected],
+                           test_mode,
+                           [projections[i] for _, i in selected],
+                           book=ebbinghaus_file,
+                           checkpoint=False)
+
+    # 更新复习计划，中途退出时未作答的单词保持到期（复习不保存测试进度，下次复习时重新取出）
+    scheduler.record_answers({selected[j][0]: correct for j, correct in results.items()})
+    scheduler.postpone([key for j, (key, _) in enumerate(selected) if j not in results])
+    print(f"本次复习{len(results)}个单词，答对{sum(results.values())}个。")
 
 
 if __name__ == '__main__':
@@ -2,12 +2,52 @@
 翻译模块：提供与翻译相关的功能，包括单词和短语的翻译查询。
 """
 
-import requests
-from bs4 import BeautifulSoup
-from time import sleep
+from bs4 import BeautifulSoup, SoupStrainer
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from threading import Lock
 import re
 
+from config import config
+from http_client import fetch
 from utils import remove_duplicates
+from translation_cache import get_cached_translation, put_cached_translation
+from dictionary_provider import TranslationProvider, LocalDictionaryProvider
+from meaning_index import CACHE_SOURCE, update_source
+from word_format import normalize_word
+
+# 优先使用更快的 lxml 解析器，未安装时使用标准库的 html.parser
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+
+def has_class(*class_names: str):
+    """
+    生成 SoupStrainer 的 class 匹配函数：标签的任一 class 在 class_names 中即匹配，
+    与 find_all 对多 class 标签（如 class="word-exp mobile"）的匹配方式一致。
+
+    Args:
+        *class_names (str): 要匹配的 class。
+
+    Returns:
+        callable: 接收 class 属性值（字符串或列表），返回是否匹配。
+    """
+    names = set(class_names)
+
+    def match(value) -> bool:
+        if not value:
+            return False
+        classes = value.split() if isinstance(value, str) else value
+        return not names.isdisjoint(classes)
+    return match
+
+
+# 只解析需要的标签，跳过页面的其余部分
+TRANSLATION_STRAINER = SoupStrainer(["div", "li"], attrs={"class": has_class("phone_con", "word-exp")})
+ENGLISH_WORDS_STRAINER = SoupStrainer("a", attrs={"class": has_class("point")})
+SYNONYMS_STRAINER = SoupStrainer("div", attrs={"class": has_class("block")})
 
 headers = {
         "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.7",
@@ -28,22 +68,36 @@ headers = {
 }
 
 
-def get_translation(word: str) -> str:
+def parse_page(html: str, strainer: SoupStrainer | None = None) -> BeautifulSoup:
     """
-    查询单词的翻译信息。
+    解析网页，只保留 strainer 匹配的标签；首选解析器出错时退回 html.parser。
 
     Args:
-        word (str): 需要查询的单词。
+        html (str): 网页内容。
+        strainer (SoupStrainer | None): 需要保留的标签，为 None 时解析整个页面。
 
     Returns:
-        str: 单词的翻译结果，包括音标和词义。
+        BeautifulSoup: 解析结果。
     """
-    # 构造翻译查询的 URL
-    url = f"https://dict.youdao.com/result?word={word}&lang=en"
+    try:
+        return BeautifulSoup(html, HTML_PARSER, parse_only=strainer)
+    except Exception:
+        if HTML_PARSER == "html.parser":
+            raise
+        return BeautifulSoup(html, "html.parser", parse_only=strainer)
+
+
+def extract_translation(html: str) -> str:
+    """
+    从有道词典的单词页面中提取音标和词义。
 
-    # 发起 HTTP 请求获取网页内容
-    response = requests.get(url)
-    soup = BeautifulSoup(response.text, "html.parser")
+    Args:
+        html (str): 网页内容。
+
+    Returns:
+        str: 翻译结果，第一行为音标，其后每行一个词义，缺失的部分用 "?" 占位。
+    """
+    soup = parse_page(html, TRANSLATION_STRAINER)
 
     # 初始化翻译结果字符串
     translation_result = ""
@@ -72,29 +126,20 @@ def get_translation(word: str) -> str:
         translation_result += "?\n"
         print(f"获取词义时出错：{e}")
 
-    # 休眠 1 秒，避免频繁请求导致的 IP 封禁
-    sleep(1)
-
-    # 返回翻译结果
     return translation_result
 
 
-def reverse_translate(chinese: str) -> list:
+def extract_english_words(html: str) -> list:
     """
-    查询汉语对应的英文单词。
+    从有道词典的汉语页面中提取对应的英文单词。
 
     Args:
-        chinese (str): 需要查询的汉语。
+        html (str): 网页内容。
 
     Returns:
-        list: 对应的英文单词列表。
+        list: 去重后的英文单词列表。
     """
-    # 构造翻译查询的 URL
-    url = f"https://dict.youdao.com/result?word={chinese}&lang=en"
-
-    # 发起 HTTP 请求获取网页内容
-    response = requests.get(url)
-    soup = BeautifulSoup(response.text, "html.parser")
+    soup = parse_page(html, ENGLISH_WORDS_STRAINER)
 
     # 初始化结果列表
     english_words = []
@@ -115,9 +160,205 @@ def reverse_translate(chinese: str) -> list:
     return remove_duplicates(english_words)
 
 
+def cache_translation_from_html(word: str, html: str) -> str:
+    """
+    从已保存的单词页面中提取翻译并写入翻译缓存，用于不联网地预热缓存。
+
+    Args:
+        word (str): 单词。
+        html (str): 该单词的有道词典页面内容。
+
+    Returns:
+        str: 提取出的翻译结果。
+    """
+    translation_result = extract_translation(html)
+    put_cached_translation(word, translation_result)
+    return translation_result
+
+
+class YoudaoProvider(TranslationProvider):
+    """
+    有道词典联网提供者，优先使用本地翻译缓存，缓存命中时不联网。
+    """
+
+    name = "youdao"
+
+    def lookup(self, word: str, use_cache: bool = True) -> str | None:
+        use_cache = use_cache and config["translation_cache_enabled"]
+        if use_cache:
+            cached = get_cached_translation(word)
+            if cached is not None:
+                return cached
+
+        # 构造翻译查询的 URL
+        url = f"https://dict.youdao.com/result?word={word}&lang=en"
+
+        # 发起 HTTP 请求获取网页内容（按主机限速，复用连接），只解析音标和词义部分
+        translation_result = extract_translation(fetch(url))
+
+        if use_cache:
+            put_cached_translation(word, translation_result)
+            if translation_result.strip() != "?":
+                update_source(CACHE_SOURCE, [normalize_word(word)], [translation_result], None, append=True)
+        return translation_result
+
+
+# 依次尝试的翻译提供者（首次查询时根据配置创建）
+translation_providers = []
+# 首次查询可能来自批量翻译的多个工作线程，创建提供者时持有该锁
+providers_lock = Lock()
+
+
+def get_translation_providers() -> list:
+    """
+    获取翻译提供者列表：配置了本地词典时先查本地词典，查不到再联网查询。
+
+    Returns:
+        list: 按顺序尝试的 TranslationProvider 列表。
+    """
+    if not translation_providers:
+        with providers_lock:
+            # 等待锁期间其他线程可能已经创建完成
+            if not translation_providers:
+                providers = []
+                if config["local_dictionary_path"]:
+                    try:
+                        providers.append(LocalDictionaryProvider(config["local_dictionary_path"]))
+                    except OSError as e:
+                        print(f"加载本地词典时出错：{e}")
+                providers.append(YoudaoProvider())
+                # 一次性填入，其他线程不会看到只创建了一部分的列表
+                translation_providers.extend(providers)
+    return translation_providers
+
+
+def get_translation(word: str, use_cache: bool = True) -> str:
+    """
+    查询单词的翻译信息，依次尝试各翻译提供者：本地词典（如已配置）、翻译缓存、有道词典。
+
+    Args:
+        word (str): 需要查询的单词。
+        use_cache (bool): 是否使用翻译缓存，为 False 时直接联网查询且不写入缓存。
+
+    Returns:
+        str: 单词的翻译结果，包括音标和词义。
+    """
+    providers = get_translation_providers()
+    for provider in providers[:-1]:
+        translation_result = provider.lookup(word, use_cache)
+        if translation_result is not None:
+            return translation_result
+
+    # 最后一个提供者的结果（包括 "?"）直接返回
+    return providers[-1].lookup(word, use_cache)
+
+
+# 本次运行中反向翻译的结果：汉语 -> Future，同一汉语只联网查询一次
+reverse_translate_futures = {}
+reverse_translate_lock = Lock()
+
+
+def print_progress(done: int, total: int) -> None:
+    """
+    在同一行打印批量查询的进度。
+
+    Args:
+        done (int): 已完成的数量。
+        total (int): 总数量。
+    """
+    print(f"\r查询进度：{done}/{total}", end="\n" if done == total else "", flush=True)
+
+
+def translate_batch(words: list, progress=print_progress) -> list:
+    """
+    并发查询一批单词的翻译，结果顺序与输入一致。
+    并发数由 config["translate_workers"] 决定，请求速率仍受各主机的限速约束。
+    单个单词查询失败或用户中断（Ctrl+C）时，返回已完成的部分结果。
+
+    Args:
+        words (list): 需要查询的单词列表。
+        progress: 进度回调，参数为已完成数量和总数量，为 None 时不报告进度。
+
+    Returns:
+        list: 与 words 一一对应的翻译结果，查询失败或未完成的单词为 None。
+    """
+    results = [None] * len(words)
+    if not words:
+        return results
+
+    executor = ThreadPoolExecutor(max_workers=config["translate_workers"])
+    futures = {executor.submit(get_translation, word): i for i, word in enumerate(words)}
+    done = 0
+    try:
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                results[i] = future.result()
+            except Exception as e:
+                print(f"\n查询单词 '{words[i]}' 时出错：{e}")
+            done += 1
+            if progress:
+                progress(done, len(words))
+    except KeyboardInterrupt:
+        print(f"\n查询已中断，已完成{done}/{len(words)}个单词。")
+    finally:
+        # 取消尚未开始的查询，不等待正在进行的查询
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return results
+
+
+def reverse_translate(chinese: str) -> list:
+    """
+    查询汉语对应的英文单词。
+
+    Args:
+        chinese (str): 需要查询的汉语。
+
+    Returns:
+        list: 对应的英文单词列表。
+    """
+    # 构造翻译查询的 URL
+    url = f"https://dict.youdao.com/result?word={chinese}&lang=en"
+
+    # 发起 HTTP 请求获取网页内容（按主机限速，复用连接），只解析单词链接部分
+    return extract_english_words(fetch(url))
+
+
+def reverse_translate_once(chinese: str) -> list:
+    """
+    查询汉语对应的英文单词，本次运行中同一汉语只查询一次：
+    已查询过的直接返回结果，正在被其他线程查询的等待其结果。
+
+    Args:
+        chinese (str): 需要查询的汉语。
+
+    Returns:
+        list: 对应的英文单词列表。
+    """
+    with reverse_translate_lock:
+        future = reverse_translate_futures.get(chinese)
+        is_owner = future is None
+        if is_owner:
+            future = Future()
+            reverse_translate_futures[chinese] = future
+
+    if is_owner:
+        try:
+            future.set_result(reverse_translate(chinese))
+        except Exception as e:
+            # 查询失败时不保留结果，下次可以重新查询
+            with reverse_translate_lock:
+                reverse_translate_futures.pop(chinese, None)
+            future.set_exception(e)
+
+    return future.result()
+
+
 def translate_with_synonyms(chinese: str) -> list:
     """
-    查询汉语词语的近义词，并为每个近义词查询对应的英文翻译。
+    查询汉语词语的近义词，并为每个近义词并发查询对应的英文翻译，
+    并发数由 config["synonym_workers"] 决定。
 
     Args:
         chinese (str): 需要查询的汉语词语。
@@ -128,9 +369,8 @@ def translate_with_synonyms(chinese: str) -> list:
     # 构造查询近义词的 URL
     url = f"https://hanyu.baidu.com/s?wd={chinese}&ptype=zici"
 
-    # 发起 HTTP 请求获取网页内容
-    response = requests.get(url)
-    soup = BeautifulSoup(response.text, "html.parser")
+    # 发起 HTTP 请求获取网页内容（按主机限速，复用连接），只解析近义词部分
+    soup = parse_page(fetch(url), SYNONYMS_STRAINER)
 
     # 初始化结果列表
     all_english_words = []
@@ -138,15 +378,20 @@ def translate_with_synonyms(chinese: str) -> list:
     # 尝试获取近义词列表
     try:
         blocks = soup.find_all("div", attrs={"class": "block"})
-        synonyms = blocks[0].get_text().split("\n")[1:-1]  # 提取近义词部分
-        for synonym in synonyms:
-            # 对每个近义词查询对应的英文翻译
-            english_words = reverse_translate(synonym)
-            all_english_words.extend(english_words)
-            sleep(1)  # 休眠 1 秒，避免频繁请求
+        synonyms = remove_duplicates(blocks[0].get_text().split("\n")[1:-1])  # 提取近义词部分
     except Exception as e:
         # 如果获取失败，记录错误
-        print(f"获取近义词或翻译时出错：{e}")
+        print(f"获取近义词时出错：{e}")
+        return all_english_words
+
+    # 对每个近义词并发查询对应的英文翻译，结果按近义词顺序合并
+    with ThreadPoolExecutor(max_workers=config["synonym_workers"]) as executor:
+        futures = [executor.submit(reverse_translate_once, synonym) for synonym in synonyms]
+        for synonym, future in zip(synonyms, futures):
+            try:
+                all_english_words.extend(future.result())
+            except Exception as e:
+                print(f"查询近义词 '{synonym}' 的翻译时出错：{e}")
 
     # 返回去重后的单词列表
     return remove_duplicates(all_english_words)
\ No newline at end of file
@@ -0,0 +1,165 @@
+"""
+翻译缓存模块：将查询过的翻译结果保存在本地 SQLite 数据库中，避免重复联网查询。
+
+缓存以规范化后的单词为键，支持过期时间、按最近访问时间淘汰（LRU），
+查询失败（结果为 "?"）的单词也会缓存一段较短的时间。
+"""
+
+import sqlite3
+from os.path import join
+from threading import Lock
+from time import time
+
+from config import config
+from word_format import normalize_word
+
+# 数据库连接（首次使用时打开）及访问锁
+connection = None
+connection_lock = Lock()
+# 缓存中的条目数，打开数据库时统计一次，之后随写入更新
+entry_count = [0]
+# 缓存的命中统计
+translation_cache_stats = {"hits": 0, "misses": 0}
+
+
+def get_connection() -> sqlite3.Connection:
+    """
+    获取缓存数据库的连接，首次调用时打开数据库并建表。
+    调用方需持有 connection_lock。
+
+    Returns:
+        sqlite3.Connection: 数据库连接。
+    """
+    global connection
+    if connection is None:
+        path = config["translation_cache_path"] or join(config["base_path"], "translation_cache.sqlite3")
+        connection = sqlite3.connect(path, check_same_thread=False)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS translations ("
+            "word TEXT PRIMARY KEY, result TEXT NOT NULL, negative INTEGER NOT NULL, "
+            "created_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        connection.execute("CREATE INDEX IF NOT EXISTS translations_accessed ON translations (accessed_at)")
+        connection.commit()
+        entry_count[0] = connection.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+    return connection
+
+
+def get_cached_translation(word: str) -> str | None:
+    """
+    从缓存中查询单词的翻译。
+
+    Args:
+        word (str): 单词。
+
+    Returns:
+        str | None: 缓存的翻译结果，未缓存或已过期时返回 None。
+    """
+    key = normalize_word(word)
+    now = time()
+    with connection_lock:
+        database = get_connection()
+        row = database.execute(
+            "SELECT result, negative, created_at FROM translations WHERE word = ?", (key,)
+        ).fetchone()
+        if row is None:
+            translation_cache_stats["misses"] += 1
+            return None
+
+        result, negative, created_at = row
+        ttl = config["translation_cache_negative_ttl"] if negative else config["translation_cache_ttl"]
+        if now - created_at > ttl:
+            database.execute("DELETE FROM translations WHERE word = ?", (key,))
+            database.commit()
+            entry_count[0] -= 1
+            translation_cache_stats["misses"] += 1
+            return None
+
+        # 只更新访问时间，随下一次写入一起提交，命中时不产生磁盘同步
+        database.execute("UPDATE translations SET accessed_at = ? WHERE word = ?", (now, key))
+        translation_cache_stats["hits"] += 1
+        return result
+
+
+def put_cached_translation(word: str, result: str) -> None:
+    """
+    将单词的翻译结果写入缓存，超出容量时淘汰最久未访问的条目。
+
+    Args:
+        word (str): 单词。
+        result (str): 翻译结果，"?" 表示查询失败。
+    """
+    key = normalize_word(word)
+    now = time()
+    negative = int(result.strip() == "?")
+    with connection_lock:
+        database = get_connection()
+        existing = database.execute("SELECT 1 FROM translations WHERE word = ?", (key,)).fetchone()
+        database.execute(
+            "INSERT OR REPLACE INTO translations (word, result, negative, created_at, accessed_at) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (key, result, negative, now, now),
+        )
+        if not existing:
+            entry_count[0] += 1
+
+        # 超出容量时按访问时间淘汰
+        overflow = entry_count[0] - config["translation_cache_max_entries"]
+        if overflow > 0:
+            database.execute(
+                "DELETE FROM translations WHERE word IN "
+                "(SELECT word FROM translations ORDER BY accessed_at LIMIT ?)",
+                (overflow,),
+            )
+            entry_count[0] -= overflow
+        database.commit()
+
+
+def read_cached_translations() -> tuple[list, list]:
+    """
+    读取缓存中所有未过期的成功翻译结果。
+
+    Returns:
+        tuple[list, list]: 单词列表和对应的翻译结果列表。
+    """
+    with connection_lock:
+        rows = get_connection().execute(
+            "SELECT word, result FROM translations WHERE negative = 0 AND created_at >= ?",
+            (time() - config["translation_cache_ttl"],),
+        ).fetchall()
+    return [row[0] for row in rows], [row[1] for row in rows]
+
+
+def clear_translation_cache() -> None:
+    """
+    清空翻译缓存。
+    """
+    with connection_lock:
+        database = get_connection()
+        database.execute("DELETE FROM translations")
+        database.commit()
+        entry_count[0] = 0
+
+
+def close_translation_cache() -> None:
+    """
+    提交尚未保存的访问时间并关闭数据库，在程序退出前调用。
+    """
+    global connection
+    with connection_lock:
+        if connection is not None:
+            connection.commit()
+            connection.close()
+            connection = None
+
+
+def get_translation_cache_stats() -> dict:
+    """
+    获取翻译缓存的命中统计。
+
+    Returns:
+        dict: 包含命中次数 hits、未命中次数 misses 和缓存条目数 entries 的字典。
+    """
+    return {**translation_cache_stats, "entries": entry_count[0]}
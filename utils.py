@@ -4,6 +4,7 @@
 
 import re
 from config import config
+from word_format import normalize_word
 
 
 def scan_and_write_to_log(prompt: str = "") -> str:
@@ -37,13 +38,28 @@ def set_line_length(input_length):
     print(f"行宽度已设置为{config["default_line_length"]}\n\n")
     return None
 
-def print_pron(input_pron : str) -> str:
+def parse_pron(input_pron : str) -> tuple[str, str | None]:
+    """
+    将音标行拆分为英式和美式两部分。
+
+    Args:
+        input_pron (str): 音标行，如 "英 /ˈæpl/ 美 /ˈæpl/"。
+
+    Returns:
+        tuple[str, str | None]: "美" 之前的部分和之后的部分，没有美式音标时后者为 None。
+    """
     l = input_pron.split('美')
+    return l[0], (l[1] if len(l) > 1 else None)
+
+def format_pron(uk_pron: str, us_pron: str | None) -> str:
     s = ''
-    s += ' '.join(list(l[0]))
-    if len(l) == 1:
+    s += ' '.join(list(uk_pron))
+    if us_pron is None:
         return s
-    return s + '\n' + '美 ' + ' '.join(list(l[1]))
+    return s + '\n' + '美 ' + ' '.join(list(us_pron))
+
+def print_pron(input_pron : str) -> str:
+    return format_pron(*parse_pron(input_pron))
 
 def print_with_single_line_length(s, line_length:int=-1) -> None:
     if line_length <= 0:
@@ -72,22 +88,54 @@ def remove_duplicates(input_list: list) -> list:
     去除列表中的重复元素，保留原始顺序。
 
     Args:
-        input_list (list): 输入的列表，可能包含重复元素。
+        input_list (list): 输入的列表，可能包含重复元素，元素需可哈希。
 
     Returns:
         list: 去重后的列表，保留原始顺序。
     """
-    # 初始化一个空列表用于存储去重后的元素
-    unique_list = []
+    # 字典的键保持插入顺序，一次遍历即可完成去重
+    return list(dict.fromkeys(input_list))
 
-    # 遍历输入列表
-    for item in input_list:
-        # 如果当前元素尚未出现在结果列表中，则添加它
-        if item not in unique_list:
-            unique_list.append(item)
 
-    # 返回去重后的列表
-    return unique_list
+def merge_duplicate_words(words: list, meanings: list) -> tuple[list, list]:
+    """
+    按规范化后的单词合并重复条目，保留单词第一次出现的位置，
+    后出现条目中不同的词义行会追加到第一次出现的条目中。
+
+    Args:
+        words (list): 单词列表。
+        meanings (list): 词义列表。
+
+    Returns:
+        tuple[list, list]: 合并后的单词列表和词义列表。
+    """
+    # 规范化单词 -> 在结果中的位置
+    positions = {}
+    merged_words = []
+    merged_lines = []
+
+    for word, meaning in zip(words, meanings):
+        key = normalize_word(word)
+        lines = meaning.split("\n")
+        if key not in positions:
+            positions[key] = len(merged_words)
+            merged_words.append(word)
+            merged_lines.append(lines)
+            continue
+
+        # 第一行是音标，只合并其后的词义行
+        existing = merged_lines[positions[key]]
+        seen = set(existing)
+        for line in (lines[1:] if len(lines) > 1 else lines):
+            if line and line not in seen:
+                # 插在末尾的空行之前，保持词义的原有格式
+                insert_at = len(existing)
+                while insert_at > 1 and not existing[insert_at - 1]:
+                    insert_at -= 1
+                existing.insert(insert_at, line)
+                seen.add(line)
+
+    return merged_words, ["\n".join(lines) for lines in merged_lines]
 
 
 def get_file_name_by_index(index: int) -> str:
@@ -113,6 +161,8 @@ def get_file_name_by_index(index: int) -> str:
         return config["wrong_dictation"]  # 错题本（听写）
     elif index == 4:
         return config["words_temp_txt_name"]
+    elif index == 5:
+        return config["words_ebbinghaus_txt_name"]  # 艾宾浩斯单词本
     else:
         return "_wrong_index"  # 如果索引无效，返回空字符串
 
@@ -180,8 +230,19 @@ def split_meanings(meanings: str) -> list:
         list: 分割后的词义列表，每个元素是一个独立的词义。
     """
     # 调用 filter_meanings 函数清理词义字符串
-    cleaned_meanings = filter_meanings(meanings)
+    return split_filtered_meanings(filter_meanings(meanings))
+
 
+def split_filtered_meanings(cleaned_meanings: str) -> list:
+    """
+    将已经过 filter_meanings 清理的词义字符串分割为单独的词义列表。
+
+    Args:
+        cleaned_meanings (str): filter_meanings 的返回值。
+
+    Returns:
+        list: 分割后的词义列表，每个元素是一个独立的词义。
+    """
     # 分割词义字符串，去除空行
     lines = [line for line in cleaned_meanings.split("\n") if line]
 
@@ -6,21 +6,57 @@
 3. 支持近义词扩展查询
 4. 单词本管理功能（删除、复制等）
 """
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from time import perf_counter
+
 from config import config
-from translate import get_translation, reverse_translate, translate_with_synonyms
-from file_io import append_words, get_file_name_by_index, read_words, write_words, save_old_file
-from utils import scan_and_write_to_log
+from translate import get_translation, reverse_translate_once, translate_with_synonyms, translate_batch
+from file_io import append_words, get_file_name_by_index, read_words, write_words, save_old_file, iter_words, \
+    get_cached_words, refresh_meaning_index
+from meaning_index import search as search_meaning_index
+from utils import scan_and_write_to_log, remove_duplicates
 
 # 当前选择的单词本索引（使用列表实现可变对象的引用传递）
 now_index = [0]
 
+def translate_and_append(words: list, skip_unknown: bool = True, known_meanings: dict | None = None) -> tuple[list, list]:
+    """
+    批量查询单词的翻译，并追加到当前选中的单词本
+
+    Args:
+        words (list): 待添加的英文单词（已去重）
+        skip_unknown (bool): 是否跳过未查到释义（结果为 "?"）的单词
+        known_meanings (dict | None): 已知释义的单词（单词 -> 释义），这些单词不再查询
+
+    Returns:
+        tuple[list, list]: 实际添加的单词及其释义
+    """
+    known_meanings = known_meanings or {}
+    unknown_words = [word for word in words if word not in known_meanings]
+    translations = dict(zip(unknown_words, translate_batch(unknown_words)))
+
+    found_words = []  # 查询成功的单词
+    meanings = []  # 对应的中文释义
+    for word in words:
+        meaning = known_meanings.get(word) or translations.get(word)
+        if meaning is None or (skip_unknown and meaning.strip() == "?"):  # 翻译失败处理
+            print(f"未找到单词 '{word}' 的翻译。")
+            continue
+        found_words.append(word)
+        meanings.append(meaning)
+
+    # 批量追加到当前选中的单词本文件
+    append_words(get_file_name_by_index(now_index[0]), found_words, meanings)
+    return found_words, meanings
+
 def change_index():
     """
-    修改当前操作的单词本索引（0-4）
+    修改当前操作的单词本索引（0-5）
 
     处理流程：
     1. 接收用户输入的数字
-    2. 验证是否为0-4的整数
+    2. 验证是否为0-5的整数
     3. 更新全局索引值
     """
     try:
@@ -28,8 +64,8 @@ def change_index():
         index_after_change = scan_and_write_to_log("请输入改变后的单词文件序号：")
         index_after_change = int(index_after_change)
         # 范围有效性检查
-        if not 0 <= index_after_change <= 4:
-            print("请输入0-4之间的数字！")
+        if not 0 <= index_after_change <= 5:
+            print("请输入0-5之间的数字！")
             return None
     except ValueError:
         print("请输入一个数字！")
@@ -41,13 +77,14 @@ def change_index():
 def print_words(file_index: int) -> None:
     """
     打印指定索引的单词本中的所有单词及其翻译
-    :param file_index: 单词本索引（0-4）
+    :param file_index: 单词本索引（0-5）
     """
-    # 读取指定索引的单词本文件
-    words, _ = read_words(get_file_name_by_index(file_index))
-    # 打印每个单词
-    for i in range(len(words)):
-        print(f"{i+1} : {words[i]}")
+    # 单词本已缓存时直接使用缓存的单词，否则流式读取单词本文件
+    file_name = get_file_name_by_index(file_index)
+    cached = get_cached_words(file_name)
+    words = cached[0] if cached is not None else (word for word, _ in iter_words(file_name))
+    for i, word in enumerate(words):
+        print(f"{i+1} : {word}")
 
 def add_words_from_english() -> None:
     """
@@ -55,39 +92,72 @@ def add_words_from_english() -> None:
 
     处理流程：
     1. 循环接收用户输入的英文单词
-    2. 支持撤销操作（r_cz指令）
-    3. 调用翻译API获取中文释义
-    4. 批量追加到指定单词本文件
+    2. 每输入一个单词就在后台查询中文释义，查到后立即显示，不阻塞下一个单词的输入
+    3. 支持撤销操作（r_cz指令），撤销时取消尚未完成的查询
+    4. 输入结束后等待未完成的查询，批量追加到指定单词本文件
     """
     print("请输入单词（输入 'add()' 结束，输入 'r_cz' 撤销上一个单词）：")
     words = []  # 存储待添加的英文单词
-    meanings = []  # 存储对应的中文翻译
-
-    while True:
-        # 获取标准化输入的单词（去除首尾空格并转小写）
-        word = scan_and_write_to_log("单词：").strip().lower()
-
-        # 处理特殊指令
-        if word == "add()":  # 结束输入指令
-            break
-        elif word == "r_cz":  # 撤销指令
-            if words:
-                print(f"已撤销上一个单词：{words.pop()}")
-                meanings.pop()
-            else:
-                print("没有可撤销的单词。")
-            continue  # 跳过后续处理
-
-        # 调用翻译函数获取中文释义
-        meaning = get_translation(word)
-
-        # 显示并存储有效结果
-        print(f"翻译：{meaning}")
-        words.append(word)
-        meanings.append(meaning)
+    lookups = []  # 对应的后台查询
+    withdrawn = set()  # 已撤销单词的查询
+    # 回调在工作线程中执行，判断是否已撤销和记录撤销都持有该锁
+    lookups_lock = Lock()
+
+    def show_translation(word, lookup):
+        """查询完成时显示结果（已撤销的单词不再显示）"""
+        with lookups_lock:
+            if lookup.cancelled() or lookup in withdrawn:
+                return
+            try:
+                print(f"\n{word}\n翻译：{lookup.result()}")
+            except Exception as e:
+                print(f"\n查询单词 '{word}' 时出错：{e}")
+
+    executor = ThreadPoolExecutor(max_workers=config["translate_workers"])
+    try:
+        while True:
+            # 获取标准化输入的单词（去除首尾空格并转小写）
+            word = scan_and_write_to_log("单词：").strip().lower()
+
+            # 处理特殊指令
+            if word == "add()":  # 结束输入指令
+                break
+            elif word == "r_cz":  # 撤销指令
+                if words:
+                    # 正在进行的查询完成后不再显示，结果也不会被添加
+                    with lookups_lock:
+                        lookup = lookups.pop()
+                        withdrawn.add(lookup)
+                        print(f"已撤销上一个单词：{words.pop()}")
+                    # 取消尚未开始的查询；取消时回调会在当前线程立即执行，因此不能持有锁
+                    lookup.cancel()
+                else:
+                    print("没有可撤销的单词。")
+                continue  # 跳过后续处理
+
+            # 在后台查询中文释义
+            lookup = executor.submit(get_translation, word)
+            words.append(word)
+            lookups.append(lookup)
+            lookup.add_done_callback(lambda done, word=word: show_translation(word, done))
+
+        # 等待尚未完成的查询
+        pending = sum(not lookup.done() for lookup in lookups)
+        if pending:
+            print(f"正在等待{pending}个单词的翻译……")
+        found_words = []
+        meanings = []
+        for word, lookup in zip(words, lookups):
+            try:
+                meanings.append(lookup.result())
+                found_words.append(word)
+            except Exception:
+                print(f"未找到单词 '{word}' 的翻译。")
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
 
     # 批量追加到当前选中的单词本文件
-    append_words(get_file_name_by_index(now_index[0]), words, meanings)
+    append_words(get_file_name_by_index(now_index[0]), found_words, meanings)
 
 def add_words_from_chinese() -> None:
     """
@@ -95,14 +165,16 @@ def add_words_from_chinese() -> None:
 
     处理流程：
     1. 接收用户输入的汉语词汇
-    2. 调用反向翻译获取对应英文单词
-    3. 去重后获取所有单词的翻译
+    2. 先在本地词义索引（所有单词本及翻译缓存）中查找词义与之相同的单词，
+       找不到时再调用反向翻译获取对应英文单词
+    3. 去重后批量并发获取所有单词的翻译（本地找到的单词直接使用已有释义）
     4. 批量保存到单词本
     """
     print("请输入汉语（输入 'add()' 结束，输入 'r_cz' 撤销上一个汉语）：")
     chinese_list = []  # 存储输入的汉语词汇
     words = []  # 收集到的英文单词
-    meanings = []  # 对应的中文释义
+    known_meanings = {}  # 本地找到的单词及其释义
+    refresh_meaning_index()
 
     while True:
         # 获取标准化输入的汉语（去除首尾空格）
@@ -117,8 +189,14 @@ def add_words_from_chinese() -> None:
                 print("已撤销上一个汉语。")
             continue
 
-        # 调用反向翻译接口获取英文单词
-        english_words = reverse_translate(chinese)
+        # 优先使用本地词义索引，找不到时再调用反向翻译接口获取英文单词
+        local_results = search_meaning_index(chinese, exact=True)
+        if local_results:
+            english_words = [result["word"] for result in local_results]
+            known_meanings.update((result["word"], result["meaning"]) for result in local_results)
+            print("（来自本地单词本）", end="")
+        else:
+            english_words = reverse_translate_once(chinese)
         if not english_words:  # 无结果处理
             print(f"未找到汉语 '{chinese}' 对应的英文单词。")
             continue
@@ -128,18 +206,27 @@ def add_words_from_chinese() -> None:
         chinese_list.append(chinese)
         words.extend(english_words)  # 扩展单词列表
 
-    # 去重处理（集合保持顺序的转换方式）
-    unique_words = list(set(words))
-    # 获取每个单词的标准翻译
-    for word in unique_words:
-        meaning = get_translation(word)
-        if meaning.strip() == "?":  # 翻译失败处理
-            print(f"未找到单词 '{word}' 的翻译。")
-            continue
-        meanings.append(meaning)
+    # 去重处理（保持输入顺序），批量并发获取每个单词的标准翻译并保存到当前单词本
+    translate_and_append(remove_duplicates(words), known_meanings=known_meanings)
 
-    # 批量保存到当前单词本
-    append_words(get_file_name_by_index(now_index[0]), unique_words, meanings)
+def search_meaning(query: str) -> None:
+    """
+    在所有单词本及翻译缓存中查找词义包含指定汉语的单词
+
+    Args:
+        query (str): 要查找的汉语
+    """
+    refresh_meaning_index()
+    begin = perf_counter()
+    results = search_meaning_index(query, limit=0)
+    elapsed = (perf_counter() - begin) * 1000
+
+    if not results:
+        print(f"未找到词义包含 '{query}' 的单词。")
+        return
+    for result in results:
+        print(f"{result['word']}：{result['sense']}  （{result['source']}）")
+    print(f"共{len(results)}个单词，查询耗时{elapsed:.3f}毫秒。")
 
 def add_words_from_chinese_synonyms() -> None:
     """
@@ -148,7 +235,7 @@ def add_words_from_chinese_synonyms() -> None:
     处理流程：
     1. 接收用户输入的汉语
     2. 查询包含近义词的英文翻译
-    3. 去重后获取所有单词的翻译
+    3. 去重后批量并发获取所有单词的翻译
     4. 批量保存到单词本
 
     与add_words_from_chinese的区别：
@@ -157,7 +244,6 @@ def add_words_from_chinese_synonyms() -> None:
     print("请输入汉语（输入 'add()' 结束，输入 'r_cz' 撤销上一个汉语）：")
     chinese_list = []  # 存储输入的汉语
     words = []  # 收集的英文单词（含近义词）
-    meanings = []  # 对应的中文释义
 
     while True:
         # 获取标准化输入的汉语
@@ -183,18 +269,8 @@ def add_words_from_chinese_synonyms() -> None:
         chinese_list.append(chinese)
         words.extend(english_words)
 
-    # 去重处理
-    unique_words = list(set(words))
-    # 获取每个单词的翻译
-    for word in unique_words:
-        meaning = get_translation(word)
-        if meaning.strip() == "?":
-            print(f"未找到单词 '{word}' 的翻译。")
-            continue
-        meanings.append(meaning)
-
-    # 批量保存到当前单词本
-    append_words(get_file_name_by_index(now_index[0]), unique_words, meanings)
+    # 去重处理（保持输入顺序），批量并发获取每个单词的翻译并保存到当前单词本
+    translate_and_append(remove_duplicates(words))
 
 def insert_words_from_english(file_index: int) -> None:
     """
@@ -257,7 +333,7 @@ def delete_words_from_file(file_index: int) -> None:
     从指定单词本中删除单词
 
     Args:
-        file_index (int): 单词本索引（0-4对应不同文件）
+        file_index (int): 单词本索引（0-5对应不同文件）
 
     处理流程：
     1. 读取指定单词本内容
@@ -324,8 +400,8 @@ def copy_portion_words(original_file_index: int,
     """
     if backup_old_temp_words:
         save_old_file(get_file_name_by_index(original_file_index))
-    # 读取源文件数据
-    words, meanings = read_words(get_file_name_by_index(original_file_index))
+    # 读取源文件数据（按需读取，只解码切片范围内的条目）
+    words, meanings = read_words(get_file_name_by_index(original_file_index), lazy=True)
     # 列表切片（begin_index-1转换为0-based，end_index不包含所以不需要-1）
     words = words[begin_index-1:end_index]
     meanings = meanings[begin_index-1:end_index]
@@ -0,0 +1,152 @@
+"""
+单词本格式模块：负责 $ 分隔的辅助文件格式的转义、序列化和流式解析。
+
+辅助文件依次存放 "单词$词义$"，字段中的 "\\" 写作 "\\\\"，"$" 写作 "\\$"，其余反斜杠按原样保留。
+旧版本写入的辅助文件不转义：不含反斜杠的旧文件按两种格式解析的结果相同，
+含反斜杠的旧文件（如词义以 "\\" 结尾）需要先用 parse_legacy_entries 读出并重写一次（见 file_io.migrate_legacy_books）。
+"""
+
+import re
+
+# 流式读取时每次读取的字符数
+CHUNK_SIZE = 1 << 16
+
+# 去掉单词开头和结尾的特殊符号
+WORD_TRIM_RE = re.compile(r'^\W+|\W+$')
+# 连续空白
+WHITESPACE_RE = re.compile(r'\s+')
+# 字段分隔符 "$" 与转义序列 "\\"、"\$"
+FIELD_TOKEN_RE = re.compile(r'(\\[\\$]|\$)')
+# 辅助文件格式的版本，记录在单词本文件夹的 FORMAT_MARKER 文件中
+FORMAT_VERSION = 2
+FORMAT_MARKER = "$format"
+
+
+def trim_word(word: str) -> str:
+    """
+    去掉单词首尾的空白和特殊符号。
+
+    Args:
+        word (str): 原始单词。
+
+    Returns:
+        str: 处理后的单词。
+    """
+    return WORD_TRIM_RE.sub('', word.strip())
+
+
+def normalize_word(word: str) -> str:
+    """
+    生成单词的规范形式，用于判断两个单词是否相同：
+    去掉首尾特殊符号，合并连续空白并转为小写。
+
+    Args:
+        word (str): 原始单词。
+
+    Returns:
+        str: 规范化后的单词。
+    """
+    return WHITESPACE_RE.sub(' ', trim_word(word)).lower()
+
+
+def escape_field(field: str) -> str:
+    """
+    转义字段中的反斜杠和 "$"，使其可以安全地写入辅助文件。
+
+    Args:
+        field (str): 单词或词义。
+
+    Returns:
+        str: 转义后的字段。
+    """
+    if "\\" not in field and "$" not in field:
+        return field
+    return field.replace("\\", "\\\\").replace("$", "\\$")
+
+
+def format_entries(words, meanings) -> str:
+    """
+    将单词和词义序列化为辅助文件的内容。
+
+    Args:
+        words: 单词序列。
+        meanings: 词义序列。
+
+    Returns:
+        str: "单词$词义$" 形式的字符串。
+    """
+    return "".join(f"{escape_field(word.strip())}${escape_field(meaning)}$"
+                   for word, meaning in zip(words, meanings))
+
+
+def parse_legacy_entries(content: str) -> tuple[list, list]:
+    """
+    按旧版本的格式（不转义，直接按 "$" 切分）解析辅助文件的内容。
+
+    Args:
+        content (str): 辅助文件的全部内容。
+
+    Returns:
+        tuple[list, list]: 处理后的单词列表和原始词义列表。
+    """
+    fields = content.split("$")
+    words = [trim_word(word) for word in fields[0:len(fields) - 1:2]]
+    meanings = fields[1::2]
+    return words, meanings
+
+
+def iter_entries(chunks):
+    """
+    从文本块流中逐个解析 (单词, 词义)，内存占用与单词本大小无关。
+
+    Args:
+        chunks: 依次产生辅助文件文本块的可迭代对象。
+
+    Yields:
+        tuple[str, str]: 处理后的单词和原始词义。
+    """
+    pieces = []  # 当前字段已读取的部分
+    word = None  # 已读完、等待词义的单词
+    carry = ""  # 块末尾尚未配对的反斜杠
+
+    for chunk in chunks:
+        chunk = carry + chunk
+        carry = ""
+        # 块末尾奇数个反斜杠时，最后一个要和下一块的首字符一起解析
+        if chunk.endswith("\\") and (len(chunk) - len(chunk.rstrip("\\"))) % 2:
+            chunk, carry = chunk[:-1], "\\"
+
+        # 本块中读完的字段
+        fields = []
+        if "\\" in chunk:
+            # 切分结果中文本与分隔符、转义序列交替出现
+            for i, token in enumerate(FIELD_TOKEN_RE.split(chunk)):
+                if i % 2 == 0:
+                    pieces.append(token)
+                elif token == "$":
+                    fields.append("".join(pieces))
+                    pieces = []
+                else:
+                    pieces.append(token[1])
+        else:
+            # 没有反斜杠时直接按 "$" 切分即可
+            parts = chunk.split("$")
+            for part in parts[:-1]:
+                pieces.append(part)
+                fields.append("".join(pieces))
+                pieces = []
+            pieces.append(parts[-1])
+
+        # 单词和词义交替出现
+        for field in fields:
+            if word is None:
+                word = field
+            else:
+                yield trim_word(word), field
+                word = None
+
+    # 与旧格式兼容：文件末尾缺少 "$" 时，最后一段仍作为词义
+    pieces.append(carry)
+    tail = "".join(pieces)
+    if word is not None and tail:
+        yield trim_word(word), tail
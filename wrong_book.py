@@ -0,0 +1,147 @@
+"""
+错题本合并模块：以增量方式把测试中的错题合并进错题本，保留历次测试的错题记录。
+
+合并时只做追加，不重写错题本：
+1. 错题本中还没有的单词追加到错题本末尾
+2. 每个答错的单词在 <name>$misses.tsv 末尾追加一行 "答错时间\t单词"
+答错次数和最近答错时间由该记录汇总得到，sort_wrong_book 按答错次数重新排列错题本，
+使最常出错的单词排在前面。测试的单词本就是错题本本身时，答对的单词从错题本中移除，
+错题本不会只增不减。合并模式用 set_merge_wrong_books 开启或关闭。
+"""
+
+from os.path import exists
+from time import time, strftime, localtime
+
+from config import config
+from file_io import append_words, read_words, write_words
+from utils import get_file_name_by_index
+from word_format import normalize_word
+
+
+def set_merge_wrong_books(enabled: int) -> None:
+    """
+    开启或关闭错题本的合并模式（config["merge_wrong_books"]）。
+
+    Args:
+        enabled (int): 非 0 时开启，0 时关闭（测试结束时覆盖错题本）。
+    """
+    config["merge_wrong_books"] = bool(enabled)
+    print(f"错题本合并模式已{'开启' if enabled else '关闭'}。")
+
+
+def get_misses_path(file_name: str) -> str:
+    """
+    获取错题本的答错记录文件路径。
+
+    Args:
+        file_name (str): 错题本文件名。
+
+    Returns:
+        str: 答错记录文件路径。
+    """
+    return f"{file_name}$misses.tsv"
+
+
+def merge_wrong_words(file_name: str, words: list, meanings: list) -> int:
+    """
+    把错题合并进错题本：新单词追加到错题本，所有错题追加一条答错记录。
+
+    Args:
+        file_name (str): 错题本文件名。
+        words (list): 答错的单词。
+        meanings (list): 对应的词义。
+
+    Returns:
+        int: 新追加到错题本的单词数。
+    """
+    if not words:
+        return 0
+    existing = {normalize_word(word) for word in read_words(file_name)[0]}
+    new_words = []
+    new_meanings = []
+    for word, meaning in zip(words, meanings):
+        key = normalize_word(word)
+        if key not in existing:
+            existing.add(key)
+            new_words.append(word)
+            new_meanings.append(meaning)
+    append_words(file_name, new_words, new_meanings)
+
+    now = time()
+    with open(get_misses_path(file_name), "a", encoding="utf-8") as file:
+        file.write("".join(f"{now:.0f}\t{normalize_word(word)}\n" for word in words))
+    return len(new_words)
+
+
+def remove_mastered_words(file_name: str, words: list) -> int:
+    """
+    从错题本中移除已经答对的单词，有单词被移除时重写错题本（答错记录保留）。
+
+    Args:
+        file_name (str): 错题本文件名。
+        words (list): 答对的单词。
+
+    Returns:
+        int: 移除的单词数。
+    """
+    if not words:
+        return 0
+    mastered = {normalize_word(word) for word in words}
+    book_words, book_meanings = read_words(file_name)
+    kept = [i for i, word in enumerate(book_words) if normalize_word(word) not in mastered]
+    removed = len(book_words) - len(kept)
+    if removed:
+        write_words(file_name, [book_words[i] for i in kept], [book_meanings[i] for i in kept], False)
+    return removed
+
+
+def read_miss_counts(file_name: str) -> dict:
+    """
+    汇总错题本的答错记录。
+
+    Args:
+        file_name (str): 错题本文件名。
+
+    Returns:
+        dict: 规范化后的单词 -> (答错次数, 最近答错时间)。
+    """
+    counts = {}
+    path = get_misses_path(file_name)
+    if not exists(path):
+        return counts
+    with open(path, "r", encoding="utf-8") as file:
+        for line in file:
+            timestamp, _, key = line.rstrip("\n").partition("\t")
+            if not key:
+                continue
+            count, last_missed = counts.get(key, (0, 0.0))
+            counts[key] = (count + 1, max(last_missed, float(timestamp)))
+    return counts
+
+
+def sort_wrong_book(file_index: int) -> None:
+    """
+    按答错次数从多到少（相同时最近答错的在前）重新排列错题本，改写前先备份。
+
+    Args:
+        file_index (int): 错题本的文件索引。
+    """
+    file_name = get_file_name_by_index(file_index)
+    words, meanings = read_words(file_name)
+    if not words:
+        print("错题本为空！")
+        return
+    counts = read_miss_counts(file_name)
+
+    def sort_key(i):
+        count, last_missed = counts.get(normalize_word(words[i]), (0, 0.0))
+        return -count, -last_missed, i
+
+    order = sorted(range(len(words)), key=sort_key)
+    write_words(file_name, [words[i] for i in order], [meanings[i] for i in order], True)
+
+    for i in order[:10]:
+        count, last_missed = counts.get(normalize_word(words[i]), (0, 0.0))
+        last = strftime('%Y-%m-%d %H:%M', localtime(last_missed)) if last_missed else "无记录"
+        print(f"{words[i]}：答错{count}次，最近答错：{last}")
+    print(f"已按答错次数重新排列{len(words)}个单词。")